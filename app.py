@@ -1,33 +1,62 @@
 import dash
-from dash import dcc, html, dash_table
+from dash import Patch, dcc, html, dash_table
 import dash_bootstrap_components as dbc
-from dash.dependencies import Input, Output, State
+from dash.dependencies import ClientsideFunction, Input, Output, State
+from dash.exceptions import PreventUpdate
+import hmac
+import os
 import pandas as pd
-from datetime import datetime, timedelta
 import plotly.graph_objects as go
+from urllib.parse import urlencode
+from flask import abort, jsonify, request
 
-from scripts.data_processing import MTARidershipData
-from scripts.visualization import (
-    generate_overview_chart,
-    generate_mode_comparison_chart,
-    generate_recovery_timeline,
-    generate_weekday_weekend_comparison,
-    generate_monthly_recovery_heatmap,
-    generate_yearly_comparison_chart
-)
+from scripts.data_processing import MTARidershipData, DEFAULT_DATA_PATH
+from scripts.hot_reload import DatasetReloader
+from scripts.http_caching import asset_url, figure_etag, init_http_caching
+from scripts.reshape import MODES
 
 # Import the sidebar component and styles
 from components.sidebar import sidebar, SIDEBAR_STYLE, SIDEBAR_HIDDEN
 
 
 # Initialize cache arrays
-from scripts.visualization import initialize_cache_arrays, filter_data
+from scripts.visualization import (
+    RENDER_VERSION, figure_key, get_figure, get_figure_json, initialize_cache_arrays,
+    overview_point_budget
+)
 # Initialize and load data
-mta_data = MTARidershipData('data/MTA_Daily_Ridership.csv')
-mta_data.load_raw_data()
-mta_data.process_data()
+# Under gunicorn the master builds the processed bundle before forking (see
+# gunicorn_config.py) and workers memory-map it instead of processing again
+mta_data = MTARidershipData(DEFAULT_DATA_PATH)
+mta_data.load(mmap=os.environ.get('MTA_SHARED_DATA') == '1')
 initialize_cache_arrays(mta_data)
 
+# Pick up changes to the CSV without restarting: new rows are ingested in a
+# background thread and swapped in, while requests keep using the old snapshot.
+# MTA_RELOAD_INTERVAL sets the seconds between checks (0 disables polling)
+reloader = DatasetReloader(
+    mta_data, initialize_cache_arrays,
+    interval=float(os.environ.get('MTA_RELOAD_INTERVAL', 60))
+).start()
+
+# With MTA_CLIENTSIDE_MODES=1, every mode's series of the per-mode charts are
+# sent once per date range and mode toggling happens in the browser
+# (assets/mode_toggle.js); the server only answers the aggregations
+CLIENTSIDE_MODES = os.environ.get('MTA_CLIENTSIDE_MODES') == '1'
+
+def dataset_tag(snapshot):
+    """Identifies a data snapshot and the figure rendering, e.g. for ETags and figure patches
+
+    Data that isn't cached as a bundle (yet) is identified by the hash of the
+    source it covers; the revision tells apart snapshots of one process.
+    """
+    version = snapshot.dataset_version or snapshot.source_digest
+    return f"{version}-{snapshot.revision}-r{RENDER_VERSION}"
+
+# Bounds of the date range selector
+DATA_START_DATE = mta_data.processed_data['Date'].min().date()
+DATA_END_DATE = mta_data.processed_data['Date'].max().date()
+
 # Add this helper function at the top of the file
 def create_tooltip(target_id, tooltip_text):
     """Create a tooltip for a given element"""
@@ -66,6 +95,71 @@ app.title = "MTA Challenge"
 
 server = app.server
 
+# Compress large JSON/JS/CSS responses and cache fingerprinted assets for good
+init_http_caching(app)
+
+@server.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Trigger a dataset reload; enabled by setting MTA_ADMIN_TOKEN (sent as a Bearer token)"""
+    token = os.environ.get('MTA_ADMIN_TOKEN')
+    if not token:
+        abort(404)
+    # Compared as bytes: compare_digest rejects str with non-ASCII characters
+    authorization = request.headers.get('Authorization', '').encode()
+    if not hmac.compare_digest(authorization, f"Bearer {token}".encode()):
+        abort(403)
+    # Under gunicorn this reaches one worker; the others pick the change up
+    # from their own file watcher
+    reloader.request_reload()
+    snapshot = mta_data.snapshot
+    return jsonify(status='scheduled', revision=snapshot.revision,
+                   dataset_version=snapshot.dataset_version), 202
+
+# Charts the dashboard loads through /figures (the overview's zoom re-fetches)
+FIGURE_ROUTE_CHARTS = {'overview-chart'}
+
+@server.route('/figures/<chart_id>')
+def figure_json(chart_id):
+    """Serialized figure for a chart and selection (?modes=A,B&start_date=&end_date=&width=)
+
+    Responses carry an ETag derived from the chart, the selection and the
+    dataset version, so clients revalidating an unchanged figure get a 304.
+    Figures sent by callbacks don't get one (Dash posts callbacks), which is
+    why overview zooms are fetched from here (see assets/overview_viewport.js).
+
+    Like the callbacks, it serves anyone, so it only renders what the
+    dashboard asks for: charts in FIGURE_ROUTE_CHARTS, known modes, dates
+    normalised to the data's extent and a point budget capped by
+    overview_point_budget. Figures are kept in the size-bounded FIGURE_CACHE.
+    """
+    if chart_id not in FIGURE_ROUTE_CHARTS:
+        abort(404)
+    modes = [mode for mode in request.args.get('modes', 'Subways').split(',') if mode]
+    if not modes or not set(modes) <= set(MODES):
+        abort(400)
+    start_date = request.args.get('start_date') or None
+    end_date = request.args.get('end_date') or None
+    max_points = None
+    if request.args.get('width'):
+        max_points = overview_point_budget(request.args['width'])
+    snapshot = mta_data.snapshot
+    try:
+        key = figure_key(chart_id, snapshot, modes, start_date, end_date, max_points)
+    except ValueError:
+        abort(400)
+
+    etag = figure_etag(key, dataset_tag(snapshot))
+    if request.if_none_match.contains_weak(etag):
+        response = server.response_class(status=304)
+    else:
+        response = server.response_class(
+            get_figure_json(chart_id, snapshot, modes, start_date, end_date, max_points),
+            mimetype='application/json'
+        )
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
 # Filters and controls
 controls = dbc.Card([
     dbc.CardBody([
@@ -115,6 +209,23 @@ controls = dbc.Card([
                 persistence_type='session'
             ),
         ], className="mb-4"),
+        html.Div([
+            html.Div([
+                html.Label("Select Date Range", className="mb-2"),
+                html.I(className="fas fa-info-circle ms-2", id="date-range-info"),
+            ], className="d-flex align-items-center mb-2"),
+            dcc.DatePickerRange(
+                id='date-range-selector',
+                min_date_allowed=DATA_START_DATE,
+                max_date_allowed=DATA_END_DATE,
+                start_date=DATA_START_DATE,
+                end_date=DATA_END_DATE,
+                display_format='MMM D, YYYY',
+                className="date-range-selector",
+                persistence=True,
+                persistence_type='session'
+            ),
+        ], className="mb-4"),
     ])
 ], className="filters-card shadow-sm")
 
@@ -299,6 +410,12 @@ tooltips = html.Div([
         • Access-A-Ride: Scheduled trips
         • Bridges and Tunnels: Toll collection data"""
     ),
+    create_tooltip(
+        "date-range-info",
+        """Restrict every chart and summary to a date window.
+        Data is filtered on the server, so narrower windows
+        also load faster."""
+    ),
     
     # New tooltips for charts
     create_tooltip(
@@ -520,6 +637,15 @@ intro_section = html.Div([
 app.layout = html.Div([
     html.Div(id='p5-background'),
     dcc.Location(id='url'),
+    # All-modes figures for clientside mode toggling (MTA_CLIENTSIDE_MODES)
+    dcc.Store(id='mode-series'),
+    # Selection the mode selector's figures on screen were rendered for, so
+    # the next one can patch them (see rendered_modes)
+    dcc.Store(id='rendered-selection'),
+    # Overview zoom events with the plot's width in pixels, and the detail
+    # figure to fetch for them (assets/overview_viewport.js)
+    dcc.Store(id='overview-viewport'),
+    dcc.Store(id='overview-detail'),
     # Barra superior con toggle y enlaces
     html.Div([
         # Lado izquierdo con toggle y título
@@ -540,7 +666,7 @@ app.layout = html.Div([
         html.Div([
             html.A(
                 html.Img(
-                    src='assets/MTA_logo.png',
+                    src=asset_url(app, 'MTA_logo.png'),
                     style={
                         'filter': 'brightness(0) invert(1)',  # Hace el logo blanco
                         'height': '20px',  # Ajustado para coincidir con los iconos de Font Awesome
@@ -668,58 +794,92 @@ def toggle_sidebar(n_clicks, sidebar_style, content_style):
 
 
 # Callbacks
-@app.callback(
-    [Output('overview-chart', 'figure'),
-     Output('mode-comparison-chart', 'figure')],
-    [Input('mode-selector', 'value')]
-)
-def update_charts(selected_modes):
-    # Filter data based on selections
-    filtered_data = filter_data(mta_data, selected_modes)
-    
-    # Get timeline events
-    timeline_events = mta_data.timeline_events
-    
-    # Generate figures
-    overview_fig = generate_overview_chart(filtered_data, timeline_events)
-    comparison_fig = generate_mode_comparison_chart(filtered_data)
+# Each callback reads mta_data.snapshot once and passes that snapshot on, so
+# all its outputs come from one version of the data even if a reload
+# publishes another meanwhile
+
+def compute_selection_bundle(snapshot, selected_modes, start_date, end_date):
+    """Aggregates shared by every output of the mode selector, computed once per selection
+
+    KPIs come from the precomputed summary cube, so no daily rows are scanned.
+    Returns None when the selection holds no data.
+    """
+    return snapshot.stats_cube.summarize(selected_modes, start_date, end_date)
+
+def overview_revision(selected_modes, start_date, end_date):
+    """uirevision of the overview: zoom survives detail re-fetches but resets on a new selection"""
+    return f"{'|'.join(sorted(selected_modes))}:{start_date}:{end_date}"
+
+def zoom_window(relayout_data):
+    """Visible x range from a relayoutData event, 'full' on autorange, None if x didn't change"""
+    if not relayout_data:
+        return None
+    if relayout_data.get('xaxis.autorange'):
+        return 'full'
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'][:2])
+    return None
+
+def mode_trace_patch(snapshot, chart_id, previous_modes, selected_modes, start_date, end_date):
+    """Patch turning a chart rendered for previous_modes into the one for selected_modes
+
+    Per-mode charts hold each mode's traces together, in MODES order, so
+    only the traces of removed modes are deleted and those of added modes
+    inserted, taken from their (cached) single-mode figures.
+    """
+    patch = Patch()
+    index = 0
+    for mode in MODES:
+        if mode not in previous_modes and mode not in selected_modes:
+            continue
+        traces = get_figure(chart_id, snapshot, [mode], start_date, end_date)['data']
+        if mode in previous_modes and mode in selected_modes:
+            index += len(traces)
+        elif mode in previous_modes:
+            # Each delete shifts the following traces down onto index
+            for _ in traces:
+                del patch['data'][index]
+        else:
+            for trace in traces:
+                patch['data'].insert(index, trace)
+                index += 1
+    return patch
+
+def rendered_modes(snapshot, rendered, start_date, end_date):
+    """Modes the figures on screen show, if they can be patched to the current selection
+
+    None when nothing was rendered yet, or when the date range or the data
+    changed since: then every figure is sent in full.
+    """
+    if rendered is None or rendered['dataset'] != dataset_tag(snapshot):
+        return None
+    if (rendered['start_date'], rendered['end_date']) != (start_date, end_date):
+        return None
+    return rendered['modes']
+
+def update_charts(snapshot, selected_modes, start_date, end_date, previous_modes=None):
+    # Figures are cached per (chart, modes, date range); with the modes on
+    # screen, the overview is patched with just the added or removed traces
+    if previous_modes is None:
+        overview_fig = get_figure('overview-chart', snapshot, selected_modes, start_date, end_date)
+    else:
+        overview_fig = mode_trace_patch(snapshot, 'overview-chart', previous_modes, selected_modes,
+                                        start_date, end_date)
+    overview_fig['layout']['uirevision'] = overview_revision(selected_modes, start_date, end_date)
+    comparison_fig = get_figure('mode-comparison-chart', snapshot, selected_modes, start_date, end_date)
     
     return overview_fig, comparison_fig
 
-@app.callback(
-    [Output('total-ridership', 'children'),
-     Output('ridership-trend', 'children'),
-     Output('trend-progress', 'value'),
-     Output('recovery-gauge', 'figure'),
-     Output('mode-rankings', 'data'),
-     Output('mode-rankings', 'columns'),
-     Output('daily-avg', 'children'),
-     Output('peak-day-value', 'children'),
-     Output('current-recovery', 'children'),
-        Output('peak-recovery', 'children')],
-    [Input('mode-selector', 'value')]
-)
-def update_summary_stats(selected_modes):
-    # Validación de entrada
-    if not selected_modes:
-        selected_modes = ['Subways']
-    filtered_data = filter_data(mta_data, selected_modes)
-    
+def update_summary_stats(bundle):
     # Enhanced total ridership calculation
-    total_ridership = filtered_data['Ridership'].sum()
+    total_ridership = bundle['total_ridership']
     formatted_ridership = f"{total_ridership:,.0f}"
     
-    # Improved trend calculation using rolling averages
-    end_date_dt = filtered_data['Date'].max()
-    
-    current_period = filtered_data[
-        filtered_data['Date'] >= (end_date_dt - timedelta(days=30))
-    ]['Ridership'].mean()
-    
-    previous_period = filtered_data[
-        (filtered_data['Date'] < (end_date_dt - timedelta(days=30))) &
-        (filtered_data['Date'] >= (end_date_dt - timedelta(days=60)))
-    ]['Ridership'].mean()
+    # Trend: last 30 days vs the previous 30-day period
+    current_period = bundle['current_period']
+    previous_period = bundle['previous_period']
     
     trend_pct = ((current_period / previous_period) - 1) * 100 if previous_period > 0 else 0
     
@@ -729,8 +889,8 @@ def update_summary_stats(selected_modes):
     progress_value = min(abs(trend_pct),100)
     
     # Enhanced recovery calculation
-    avg_recovery = filtered_data.groupby('Date')['Recovery_Percentage'].mean().mean()
-    peak_recovery = filtered_data.groupby('Date')['Recovery_Percentage'].mean().max()
+    avg_recovery = bundle['avg_recovery']
+    peak_recovery = bundle['peak_recovery']
     
     # Update gauge figure with improved visualization
     gauge_fig = go.Figure(go.Indicator(
@@ -795,10 +955,7 @@ def update_summary_stats(selected_modes):
     }
     
     # Enhanced rankings table
-    rankings_df = filtered_data.groupby('Mode').agg({
-        'Ridership': 'sum',
-        'Recovery_Percentage': 'mean'
-    }).round(4)  # Aumentamos la precisión antes de formatear
+    rankings_df = bundle['mode_totals'].round(4)  # Aumentamos la precisión antes de formatear
 
     # Multiplicamos por 100 antes de ordenar
     rankings_df['Recovery_Percentage'] = rankings_df['Recovery_Percentage'] * 100
@@ -823,9 +980,8 @@ def update_summary_stats(selected_modes):
     ]
     
     # New calculations for additional metrics
-    daily_avg = filtered_data['Ridership'].mean()
-    peak_day_data = filtered_data.loc[filtered_data['Ridership'].idxmax()]
-    peak_day_str = f"{peak_day_data['Date'].strftime('%b %d, %Y')} ({peak_day_data['Ridership']:,.0f})"
+    daily_avg = bundle['daily_avg']
+    peak_day_str = f"{bundle['peak_day'].strftime('%b %d, %Y')} ({bundle['peak_value']:,.0f})"
     
 
         # Format recovery values
@@ -851,26 +1007,209 @@ def update_summary_stats(selected_modes):
     Input('yearly-comparison-mode', 'value')
 )
 def update_yearly_comparison(selected_mode):
-    return generate_yearly_comparison_chart(
-        mta_data.processed_data,  # Use full dataset
-        selected_mode
+    # Uses the full dataset of the selected mode
+    return get_figure('yearly-comparison-chart', mta_data.snapshot, [selected_mode])
+
+def update_recovery_analysis(snapshot, selected_modes, start_date, end_date, previous_modes=None):
+    # The violins shift position with the selection and the heatmap is a
+    # single trace, so only the timeline is patched
+    if previous_modes is None:
+        timeline_fig = get_figure('recovery-timeline', snapshot, selected_modes, start_date, end_date)
+    else:
+        timeline_fig = mode_trace_patch(snapshot, 'recovery-timeline', previous_modes, selected_modes,
+                                        start_date, end_date)
+    return (
+        timeline_fig,
+        *(get_figure(chart_id, snapshot, selected_modes, start_date, end_date)
+          for chart_id in ('weekday-weekend-comparison', 'monthly-recovery-heatmap'))
     )
 
-@app.callback(
-    [Output("recovery-timeline", "figure"),
-     Output("weekday-weekend-comparison", "figure"),
-     Output("monthly-recovery-heatmap", "figure")],
-    [Input("mode-selector", "value")]
-)
-def update_recovery_analysis(selected_modes):
-    filtered_data = filter_data(mta_data, selected_modes)
+SELECTION_INPUTS = [
+    Input('mode-selector', 'value'),
+    Input('date-range-selector', 'start_date'),
+    Input('date-range-selector', 'end_date')
+]
+
+SUMMARY_OUTPUTS = [
+    Output('total-ridership', 'children'),
+    Output('ridership-trend', 'children'),
+    Output('trend-progress', 'value'),
+    Output('recovery-gauge', 'figure'),
+    Output('mode-rankings', 'data'),
+    Output('mode-rankings', 'columns'),
+    Output('daily-avg', 'children'),
+    Output('peak-day-value', 'children'),
+    Output('current-recovery', 'children'),
+    Output('peak-recovery', 'children')
+]
+
+# Charts drawn from per-mode traces, which the browser can filter by itself
+MODE_SERIES_CHARTS = ('overview-chart', 'recovery-timeline', 'weekday-weekend-comparison')
+
+def update_mode_views(selected_modes, start_date, end_date, rendered=None):
+    # Validación de entrada
+    if not selected_modes:
+        selected_modes = ['Subways']
+    snapshot = mta_data.snapshot
+    bundle = compute_selection_bundle(snapshot, selected_modes, start_date, end_date)
+    if bundle is None:
+        raise PreventUpdate
     
+    previous_modes = rendered_modes(snapshot, rendered, start_date, end_date)
+    # A zoomed overview holds detail traces of another range: send it in full
+    overview_modes = None if previous_modes is None or rendered['overview_window'] else previous_modes
     return (
-        generate_recovery_timeline(filtered_data),
-        generate_weekday_weekend_comparison(filtered_data),
-        generate_monthly_recovery_heatmap(filtered_data)
+        *update_charts(snapshot, selected_modes, start_date, end_date, overview_modes),
+        *update_summary_stats(bundle),
+        *update_recovery_analysis(snapshot, selected_modes, start_date, end_date, previous_modes),
+        {'modes': sorted(selected_modes), 'start_date': start_date, 'end_date': end_date,
+         'dataset': dataset_tag(snapshot), 'overview_window': None}
     )
 
+def update_mode_series(start_date, end_date):
+    # Every mode at once; the mode selector only filters traces in the browser
+    snapshot = mta_data.snapshot
+    return {
+        chart_id: get_figure(chart_id, snapshot, MODES, start_date, end_date)
+        for chart_id in MODE_SERIES_CHARTS
+    }
+
+def update_mode_aggregates(selected_modes, start_date, end_date):
+    # The outputs of update_mode_views that aggregate across the selected modes
+    if not selected_modes:
+        selected_modes = ['Subways']
+    snapshot = mta_data.snapshot
+    bundle = compute_selection_bundle(snapshot, selected_modes, start_date, end_date)
+    if bundle is None:
+        raise PreventUpdate
+    
+    return (
+        get_figure('mode-comparison-chart', snapshot, selected_modes, start_date, end_date),
+        *update_summary_stats(bundle),
+        get_figure('monthly-recovery-heatmap', snapshot, selected_modes, start_date, end_date)
+    )
+
+if CLIENTSIDE_MODES:
+    app.callback(
+        Output('mode-series', 'data'),
+        SELECTION_INPUTS[1:]
+    )(update_mode_series)
+    app.callback(
+        [Output('mode-comparison-chart', 'figure'),
+         *SUMMARY_OUTPUTS,
+         Output('monthly-recovery-heatmap', 'figure')],
+        SELECTION_INPUTS
+    )(update_mode_aggregates)
+    app.clientside_callback(
+        ClientsideFunction(namespace='modes', function_name='selectModes'),
+        [Output(chart_id, 'figure') for chart_id in MODE_SERIES_CHARTS],
+        [Input('mode-selector', 'value'),
+         Input('mode-series', 'data')],
+        [State('date-range-selector', 'start_date'),
+         State('date-range-selector', 'end_date')]
+    )
+else:
+    # Every output driven by the mode selector is served by one callback, so
+    # the selection is filtered and aggregated once per interaction
+    app.callback(
+        [Output('overview-chart', 'figure'),
+         Output('mode-comparison-chart', 'figure'),
+         *SUMMARY_OUTPUTS,
+         Output('recovery-timeline', 'figure'),
+         Output('weekday-weekend-comparison', 'figure'),
+         Output('monthly-recovery-heatmap', 'figure'),
+         Output('rendered-selection', 'data')],
+        SELECTION_INPUTS,
+        State('rendered-selection', 'data')
+    )(update_mode_views)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='overview', function_name='viewport'),
+    Output('overview-viewport', 'data'),
+    Input('overview-chart', 'relayoutData'),
+    prevent_initial_call=True
+)
+
+@app.callback(
+    [Output('overview-detail', 'data'),
+     Output('rendered-selection', 'data', allow_duplicate=True)],
+    Input('overview-viewport', 'data'),
+    [State('mode-selector', 'value'),
+     State('date-range-selector', 'start_date'),
+     State('date-range-selector', 'end_date'),
+     State('rendered-selection', 'data')],
+    prevent_initial_call=True
+)
+def update_overview_detail(viewport, selected_modes, start_date, end_date, rendered_selection=None):
+    # The overview is downsampled over the selected range; on zoom, re-fetch
+    # the visible window (plus half a window each side for panning) with a
+    # point budget sized to the plot's width. Double-click autorange restores
+    # the overview. The browser fetches the figure from /figures, so
+    # revisited windows are revalidated against their ETag
+    if not viewport:
+        raise PreventUpdate
+    window = zoom_window(viewport.get('relayout'))
+    if window is None:
+        raise PreventUpdate
+    if not selected_modes:
+        selected_modes = ['Subways']
+    
+    detail_start, detail_end = start_date, end_date
+    if window != 'full':
+        visible_start, visible_end = sorted(pd.Timestamp(bound) for bound in window)
+        margin = (visible_end - visible_start) / 2
+        detail_start = (visible_start - margin).floor('D')
+        detail_end = (visible_end + margin).ceil('D')
+        if start_date is not None:
+            detail_start = max(detail_start, pd.Timestamp(start_date))
+        if end_date is not None:
+            detail_end = min(detail_end, pd.Timestamp(end_date))
+        if detail_end < detail_start:
+            raise PreventUpdate
+        detail_start, detail_end = detail_start.date(), detail_end.date()
+    
+    query = {'modes': ','.join(selected_modes)}
+    if detail_start is not None:
+        query['start_date'] = str(detail_start)
+    if detail_end is not None:
+        query['end_date'] = str(detail_end)
+    if viewport.get('width'):
+        query['width'] = viewport['width']
+    detail = {
+        'url': f"{app.get_relative_path('/figures/overview-chart')}?{urlencode(query)}",
+        'uirevision': overview_revision(selected_modes, start_date, end_date),
+        'range': None if window == 'full' else list(window)
+    }
+    # Mode changes can't patch the detail traces (see update_mode_views)
+    rendered = dash.no_update if rendered_selection is None else Patch()
+    if rendered_selection is not None:
+        rendered['overview_window'] = None if window == 'full' else [str(detail_start), str(detail_end)]
+    return detail, rendered
+
+app.clientside_callback(
+    ClientsideFunction(namespace='overview', function_name='loadDetail'),
+    Output('overview-chart', 'figure', allow_duplicate=True),
+    Input('overview-detail', 'data'),
+    prevent_initial_call=True
+)
+
+@app.callback(
+    [Output('date-range-selector', 'max_date_allowed'),
+     Output('date-range-selector', 'end_date')],
+    Input('url', 'pathname'),
+    [State('date-range-selector', 'max_date_allowed'),
+     State('date-range-selector', 'end_date')]
+)
+def refresh_date_bounds(_, max_date_allowed, end_date):
+    # Dates ingested after start-up become selectable, and a range ending on
+    # the previous last date keeps following the data
+    latest = pd.Timestamp(mta_data.stats_cube.dates[-1])
+    if max_date_allowed is not None and pd.Timestamp(max_date_allowed) >= latest:
+        raise PreventUpdate
+    if end_date is None or max_date_allowed is None or pd.Timestamp(end_date) >= pd.Timestamp(max_date_allowed):
+        end_date = latest.date()
+    return latest.date(), end_date
+
 app.clientside_callback(
     """
     function(url) {
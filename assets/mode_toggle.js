@@ -0,0 +1,96 @@
+// Clientside mode toggling (enabled with MTA_CLIENTSIDE_MODES=1).
+//
+// The server ships the overview, recovery timeline and weekday/weekend
+// figures once per date range with every mode in them (the 'mode-series'
+// store); each per-mode trace carries its mode in `meta`. Changing the mode
+// selection only filters those traces here, without a server round trip.
+
+(function () {
+    const DEFAULT_MODES = ['Subways'];
+
+    // plotly.js typed array dtypes (see scripts/figure_encoding.py)
+    const TYPED_ARRAYS = {
+        f8: Float64Array, f4: Float32Array,
+        i4: Int32Array, i2: Int16Array, i1: Int8Array,
+        u4: Uint32Array, u2: Uint16Array, u1: Uint8Array
+    };
+
+    function decodeArray(values) {
+        if (!values || !values.bdata) {
+            return values;
+        }
+        const binary = atob(values.bdata);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return new TYPED_ARRAYS[values.dtype](bytes.buffer);
+    }
+
+    // Traces of the selected modes; traces without a mode are always kept
+    function selectTraces(figure, modes) {
+        return figure.data.filter(trace => trace.meta === undefined || modes.includes(trace.meta));
+    }
+
+    // Same key as overview_revision in app.py, so zoom detail re-fetches keep the view
+    function overviewRevision(modes, startDate, endDate) {
+        const bound = value => (value === null || value === undefined) ? 'None' : value;
+        return `${[...modes].sort().join('|')}:${bound(startDate)}:${bound(endDate)}`;
+    }
+
+    function overview(figure, modes, startDate, endDate) {
+        return {
+            ...figure,
+            data: selectTraces(figure, modes),
+            layout: {...figure.layout, uirevision: overviewRevision(modes, startDate, endDate)}
+        };
+    }
+
+    function recoveryTimeline(figure, modes) {
+        return {...figure, data: selectTraces(figure, modes)};
+    }
+
+    // Violins sit at one x position per mode: restack the selected ones
+    function weekdayWeekend(figure, modes) {
+        const allModes = figure.layout.xaxis.ticktext || [];
+        const shown = allModes.filter(mode => modes.includes(mode));
+        const data = selectTraces(figure, modes).map(trace => {
+            const position = shown.indexOf(trace.meta);
+            const shift = position - allModes.indexOf(trace.meta);
+            return {
+                ...trace,
+                x: decodeArray(trace.x).map(x => x + shift),
+                showlegend: position === 0
+            };
+        });
+        return {
+            ...figure,
+            data: data,
+            layout: {
+                ...figure.layout,
+                xaxis: {
+                    ...figure.layout.xaxis,
+                    tickvals: shown.map((_, i) => i),
+                    ticktext: shown,
+                    range: [-0.6, shown.length - 0.4]
+                }
+            }
+        };
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        modes: {
+            selectModes: function (selectedModes, series, startDate, endDate) {
+                if (!series) {
+                    return Array(3).fill(window.dash_clientside.no_update);
+                }
+                const modes = (selectedModes && selectedModes.length) ? selectedModes : DEFAULT_MODES;
+                return [
+                    overview(series['overview-chart'], modes, startDate, endDate),
+                    recoveryTimeline(series['recovery-timeline'], modes),
+                    weekdayWeekend(series['weekday-weekend-comparison'], modes)
+                ];
+            }
+        }
+    });
+})();
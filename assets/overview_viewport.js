@@ -0,0 +1,42 @@
+// Overview zoom events with the plot's width, and the detail figures fetched for them.
+//
+// The server downsamples a zoomed overview to a point budget derived from
+// the plot area's width in pixels (see overview_point_budget), which only
+// the browser knows, so each relayout event is forwarded together with it.
+// The detail figure is then fetched from /figures rather than returned by a
+// callback, so the browser can revalidate it against its ETag (a 304 when
+// the window was seen before and the data hasn't changed).
+
+(function () {
+    function plotWidth(graphId) {
+        const graph = document.querySelector('#' + graphId + ' .js-plotly-plot');
+        const size = graph && graph._fullLayout && graph._fullLayout._size;
+        return size ? Math.round(size.w) : null;
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        overview: {
+            viewport: function (relayoutData) {
+                if (!relayoutData) {
+                    return window.dash_clientside.no_update;
+                }
+                return {relayout: relayoutData, width: plotWidth('overview-chart')};
+            },
+            loadDetail: async function (detail) {
+                if (!detail) {
+                    return window.dash_clientside.no_update;
+                }
+                const response = await fetch(detail.url);
+                if (!response.ok) {
+                    return window.dash_clientside.no_update;
+                }
+                const figure = await response.json();
+                figure.layout = Object.assign({}, figure.layout, {uirevision: detail.uirevision});
+                if (detail.range) {
+                    figure.layout.xaxis = Object.assign({}, figure.layout.xaxis, {range: detail.range});
+                }
+                return figure;
+            }
+        }
+    });
+})();
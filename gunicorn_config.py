@@ -1,3 +1,5 @@
+import os
+
 # Configuración para mejor manejo de recursos
 bind = "0.0.0.0:8080"
 workers = 3  # Número de workers
@@ -6,3 +8,24 @@ worker_class = 'gthread'  # Usar threads
 worker_connections = 1000
 timeout = 30
 keepalive = 2 
+
+
+def on_starting(server):
+    """Build the processed data bundle once in the master, before workers fork.
+
+    Workers then memory-map the same read-only column files, so resident
+    memory stays flat as workers are added and respawned workers skip
+    processing entirely.
+    """
+    from scripts.data_processing import MTARidershipData, DEFAULT_DATA_PATH
+
+    data = MTARidershipData(DEFAULT_DATA_PATH)
+    if not data.load():
+        return
+    os.environ['MTA_SHARED_DATA'] = '1'
+
+    # Opcional: pre-renderizar figuras (MTA_WARMUP_TOP=all o un número N)
+    warmup_top = os.environ.get('MTA_WARMUP_TOP')
+    if warmup_top:
+        from scripts.warmup import report, warm_up
+        report(warm_up(data, top=None if warmup_top == 'all' else int(warmup_top)))
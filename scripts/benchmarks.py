@@ -0,0 +1,169 @@
+# Micro-benchmarks for the data pipeline and figure builders.
+#
+# Usage: python -m scripts.benchmarks reshape --scales 1 10 100
+#        python -m scripts.benchmarks serialization --scales 1
+#        python -m scripts.benchmarks builders --scales 1 10
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.data_processing import DEFAULT_DATA_PATH, MTARidershipData
+from scripts.data_store import RidershipStore
+from scripts.figure_encoding import figure_to_json
+from scripts.reshape import MODE_COLUMNS, MODES, extract_wide_blocks, wide_to_long
+from scripts.visualization import CHART_BUILDERS, initialize_cache_arrays, render_figure
+
+
+def make_synthetic_csv(scale, source=DEFAULT_DATA_PATH, directory=None):
+    """Write a CSV with `scale` times the rows of the source, on consecutive timestamps.
+
+    Timestamps are daily while they fit in the datetime64[ns] range and
+    hourly beyond that, like a finer-grained export.
+    """
+    base = pd.read_csv(source, parse_dates=['Date'])
+    synthetic = pd.concat([base] * scale, ignore_index=True)
+    freq = 'D' if len(synthetic) < 80_000 else 'h'
+    synthetic['Date'] = pd.date_range(base['Date'].iloc[0], periods=len(synthetic), freq=freq)
+
+    fd, path = tempfile.mkstemp(suffix='.csv', dir=directory)
+    os.close(fd)
+    synthetic.to_csv(path, index=False)
+    return path
+
+
+def _timeit(func, repeat=5):
+    """Best wall-clock time of several runs, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _legacy_reshape(df):
+    """Per-mode loop + concat + .dt accessors, as process_data used to do it."""
+    transformed_data = []
+    for ridership_col, percentage_col in MODE_COLUMNS:
+        mode = ridership_col.split(':')[0].strip()
+        transformed_data.append(pd.DataFrame({
+            'Date': df['Date'],
+            'Mode': mode,
+            'Ridership': df[ridership_col],
+            'Recovery_Percentage': df[percentage_col]
+        }))
+    processed_df = pd.concat(transformed_data, ignore_index=True)
+    processed_df['Year'] = processed_df['Date'].dt.year
+    processed_df['Month'] = processed_df['Date'].dt.month
+    processed_df['DayOfWeek'] = processed_df['Date'].dt.dayofweek
+    processed_df['IsWeekend'] = processed_df['DayOfWeek'].isin([5, 6])
+    return processed_df
+
+
+def _vectorized_reshape(df):
+    dates, ridership, recovery = extract_wide_blocks(df)
+    return wide_to_long(dates, MODES, {'Ridership': ridership, 'Recovery_Percentage': recovery})
+
+
+def benchmark_reshape(scales):
+    """Compare the legacy and vectorized wide-to-long reshape on synthetic CSVs."""
+    print(f"{'scale':>6} {'rows':>9} {'legacy ms':>10} {'vector ms':>10} {'speedup':>8}")
+    for scale in scales:
+        path = make_synthetic_csv(scale)
+        try:
+            df = pd.read_csv(path, parse_dates=['Date'])
+            legacy = _timeit(lambda: _legacy_reshape(df))
+            vectorized = _timeit(lambda: _vectorized_reshape(df))
+            print(f"{scale:>6} {len(df) * len(MODES):>9} {legacy:>10.2f} {vectorized:>10.2f} "
+                  f"{legacy / vectorized:>7.1f}x")
+        finally:
+            os.remove(path)
+
+
+def _load_synthetic(scale):
+    """Process a synthetic CSV of the given scale without touching the cache."""
+    path = make_synthetic_csv(scale)
+    try:
+        data = MTARidershipData(path, cache_dir=None)
+        data.load_raw_data()
+        data.process_data()
+        return data
+    finally:
+        os.remove(path)
+
+
+def _legacy_filter(records, modes):
+    """np.isin over a record array + from_records, as the filter cache used to do it."""
+    return pd.DataFrame.from_records(records[np.isin(records['Mode'], modes)])
+
+
+def benchmark_filter(scales):
+    """Compare record-array filtering with the indexed store for one and three modes."""
+    print(f"{'scale':>6} {'rows':>9} {'modes':>5} {'legacy ms':>10} {'store ms':>9} {'speedup':>8}")
+    for scale in scales:
+        frame = _load_synthetic(scale).processed_data
+        records = frame.assign(Mode=frame['Mode'].astype(str)).to_records(index=False)
+        store = RidershipStore(frame)
+        for modes in (('LIRR',), ('Buses', 'LIRR', 'Subways')):
+            legacy = _timeit(lambda: _legacy_filter(records, modes))
+            indexed = _timeit(lambda: store.select(modes))
+            print(f"{scale:>6} {len(frame):>9} {len(modes):>5} {legacy:>10.2f} {indexed:>9.3f} "
+                  f"{legacy / indexed:>7.0f}x")
+
+
+def benchmark_serialization(scales, modes=('Buses', 'LIRR', 'Subways')):
+    """Compare plain figure JSON (stdlib and orjson) with binary-encoded arrays, per chart."""
+    print(f"{'scale':>6} {'chart':<28} {'plain KB':>9} {'compact KB':>10} "
+          f"{'json ms':>8} {'orjson ms':>9} {'compact ms':>10}")
+    for scale in scales:
+        data = _load_synthetic(scale)
+        initialize_cache_arrays(data)
+        for chart_id in CHART_BUILDERS:
+            fig = render_figure(chart_id, data, list(modes))
+            plain, compact = fig.to_json(), figure_to_json(fig)
+            stdlib = _timeit(lambda: fig.to_json(engine='json'))
+            fast = _timeit(lambda: fig.to_json(engine='orjson'))
+            encoded = _timeit(lambda: figure_to_json(fig))
+            print(f"{scale:>6} {chart_id:<28} {len(plain) / 1024:>9.1f} {len(compact) / 1024:>10.1f} "
+                  f"{stdlib:>8.2f} {fast:>9.2f} {encoded:>10.2f}")
+
+
+def benchmark_builders(scales, modes=('Buses', 'LIRR', 'Subways')):
+    """Time each chart builder on a full-range selection (filtered rows are cached, as in the app).
+
+    To compare with an earlier version, run it in a git worktree of that commit.
+    """
+    print(f"{'scale':>6} {'chart':<28} {'build ms':>9} {'traces':>7}")
+    for scale in scales:
+        data = _load_synthetic(scale)
+        initialize_cache_arrays(data)
+        for chart_id in CHART_BUILDERS:
+            traces = len(render_figure(chart_id, data, list(modes)).data)
+            elapsed = _timeit(lambda: render_figure(chart_id, data, list(modes)))
+            print(f"{scale:>6} {chart_id:<28} {elapsed:>9.2f} {traces:>7}")
+
+
+BENCHMARKS = {
+    'reshape': benchmark_reshape,
+    'filter': benchmark_filter,
+    'serialization': benchmark_serialization,
+    'builders': benchmark_builders,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run data pipeline benchmarks")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help="Synthetic dataset sizes as multiples of the real CSV")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args.scales)
+
+
+if __name__ == '__main__':
+    main()
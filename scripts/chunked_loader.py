@@ -0,0 +1,273 @@
+# Streaming, fixed-memory processing of large wide-format ridership CSVs.
+#
+# Usage: python -m scripts.chunked_loader input.csv output_dir [--memory-mb 256]
+
+import argparse
+import glob
+import logging
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from scripts.data_cache import load_frame_bundle, save_frame_bundle
+from scripts.data_processing import build_long_frame, derive_blocks
+from scripts.reshape import MODE_COLUMNS, MODES, extract_wide_blocks, long_to_wide
+from scripts.window_stats import WINDOW_SPECS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Approximate long-format columns produced per mode and source row
+_LONG_COLUMNS = 20
+
+SUMMARY_COLUMNS = ['Ridership', 'Recovery_Percentage', 'Pre_Pandemic_Baseline']
+
+
+def chunk_rows_for_budget(memory_budget, n_columns=1 + 2 * len(MODE_COLUMNS), n_modes=len(MODES)):
+    """Source rows per chunk so a parsed chunk and its long-format copy fit the budget.
+
+    Each wide row becomes n_modes long rows of roughly _LONG_COLUMNS 8-byte
+    values; intermediates are assumed to double the peak.
+    """
+    row_bytes = 8 * n_columns + 8 * n_modes * _LONG_COLUMNS
+    return max(1, int(memory_budget // (2 * row_bytes)))
+
+
+def _last_valid_rows(valid, stop):
+    """Per column, the last row < stop whose value is valid (-1 if none)."""
+    head = valid[:stop]
+    if len(head) == 0:
+        return np.full(valid.shape[1], -1)
+    found = head.any(axis=0)
+    return np.where(found, stop - 1 - np.argmax(head[::-1], axis=0), -1)
+
+
+def _advance_seed(seed, values, valid, keep):
+    """Gap-filling seed (last valid value and its age, per column) of rows from `keep` on.
+
+    seed is the one of the current buffer, whose rows before keep are dropped.
+    """
+    seed_values, seed_ages = seed
+    last = _last_valid_rows(valid, keep)
+    found = last >= 0
+    columns = np.arange(values.shape[1])
+    return (np.where(found, values[np.maximum(last, 0), columns], seed_values),
+            np.where(found, keep - last, seed_ages + keep))
+
+
+def _filled_rows(valid, seed, limit):
+    """Leading rows of a buffer whose interpolated values can't change with later rows.
+
+    A column's trailing gap is pending until it is closed by a value or grows
+    past `limit` rows (it is then left NaN as a whole); leading gaps without
+    a seed are always NaN.
+    """
+    n = valid.shape[0]
+    last = _last_valid_rows(valid, n)
+    last = np.where(last >= 0, last, np.where(np.isnan(seed[0]), n, -seed[1]))
+    gap = n - 1 - last
+    pending = (gap > 0) & (gap <= limit)
+    return int(max(0, (last[pending] + 1).min())) if pending.any() else n
+
+
+class RunningAggregates:
+    """Per-mode and per-month sums, counts and extremes merged chunk by chunk.
+
+    Only (modes,) and (months, modes) accumulators are kept, so memory does
+    not grow with the number of rows; means are sum / count at the end.
+    """
+
+    def __init__(self, modes=MODES):
+        self.modes = list(modes)
+        shape = len(self.modes)
+        self.sums = {name: np.zeros(shape) for name in SUMMARY_COLUMNS}
+        self.counts = {name: np.zeros(shape, dtype=np.int64) for name in SUMMARY_COLUMNS}
+        self.minima = {name: np.full(shape, np.inf) for name in SUMMARY_COLUMNS}
+        self.maxima = {name: np.full(shape, -np.inf) for name in SUMMARY_COLUMNS}
+        # (year, month) -> {column: (sums, counts)}
+        self.monthly = {}
+
+    def update(self, dates, blocks):
+        """Merge the (dates x modes) blocks of one chunk."""
+        for name in SUMMARY_COLUMNS:
+            values = blocks[name]
+            valid = ~np.isnan(values)
+            self.sums[name] += np.where(valid, values, 0.0).sum(axis=0)
+            self.counts[name] += valid.sum(axis=0)
+            if valid.any():
+                self.minima[name] = np.fmin(self.minima[name], np.nanmin(np.where(valid, values, np.inf), axis=0))
+                self.maxima[name] = np.fmax(self.maxima[name], np.nanmax(np.where(valid, values, -np.inf), axis=0))
+
+        month_keys = dates.year.to_numpy() * 12 + dates.month.to_numpy() - 1
+        keys, inverse = np.unique(month_keys, return_inverse=True)
+        for name in ('Ridership', 'Recovery_Percentage'):
+            values = blocks[name]
+            valid = ~np.isnan(values)
+            sums = np.zeros((len(keys), len(self.modes)))
+            counts = np.zeros((len(keys), len(self.modes)), dtype=np.int64)
+            np.add.at(sums, inverse, np.where(valid, values, 0.0))
+            np.add.at(counts, inverse, valid)
+            for i, key in enumerate(keys):
+                entry = self.monthly.setdefault((int(key) // 12, int(key) % 12 + 1), {})
+                previous_sums, previous_counts = entry.get(name, (0.0, 0))
+                entry[name] = (previous_sums + sums[i], previous_counts + counts[i])
+
+    def summary_stats(self):
+        """Mean, min and max per mode, shaped like MTARidershipData.get_summary_stats."""
+        columns = {}
+        for name in SUMMARY_COLUMNS:
+            counts = self.counts[name]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                columns[(name, 'mean')] = np.where(counts > 0, self.sums[name] / counts, np.nan)
+            if name != 'Pre_Pandemic_Baseline':
+                columns[(name, 'min')] = np.where(counts > 0, self.minima[name], np.nan)
+                columns[(name, 'max')] = np.where(counts > 0, self.maxima[name], np.nan)
+        summary = pd.DataFrame(columns, index=pd.CategoricalIndex(self.modes, categories=self.modes, name='Mode'))
+        return summary.round(2)
+
+    def monthly_means(self):
+        """Mean ridership and recovery per (Mode, Year, Month)."""
+        rows = []
+        for (year, month), entry in sorted(self.monthly.items()):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = {name: sums / counts for name, (sums, counts) in entry.items()}
+            for i, mode in enumerate(self.modes):
+                rows.append({'Mode': mode, 'Year': year, 'Month': month,
+                             'Ridership': means['Ridership'][i],
+                             'Recovery_Percentage': means['Recovery_Percentage'][i]})
+        frame = pd.DataFrame(rows, columns=['Mode', 'Year', 'Month', 'Ridership', 'Recovery_Percentage'])
+        return frame.sort_values(['Mode', 'Year', 'Month'], ignore_index=True)
+
+
+def stream_process_csv(filepath, output_dir, memory_budget=DEFAULT_MEMORY_BUDGET,
+                       fill_strategy='ffill', fill_limit=None):
+    """Process a wide CSV chunk by chunk into long-format bundles under output_dir.
+
+    Each chunk runs the same pipeline as MTARidershipData.process_data.
+    Source rows whose filled values or centered windows could still change
+    are carried into the next chunk, with a window of history before them;
+    each mode's last observation before the carried rows is passed on as a
+    gap-filling seed, so the written rows match a full in-memory run. Rows
+    can't be sorted across chunks, so the CSV must be in ascending date
+    order (a ValueError is raised otherwise).
+
+    The buffer (carried plus new rows) stays within the rows the memory
+    budget allows. Forward-filled and masked values never depend on later
+    rows; interpolation looks ahead at most fill_limit rows, and at most
+    half a buffer: longer gaps are left NaN, as if fill_limit were that
+    size. Returns the RunningAggregates of the processed rows.
+    """
+    buffer_rows = chunk_rows_for_budget(memory_budget)
+    max_window = max(window for _, window, _, _ in WINDOW_SPECS.values())
+    # Rows after a row that its centered windows read
+    max_after = max((window - 1) // 2 for _, window, center, _ in WINDOW_SPECS.values() if center)
+    lookahead = 0
+    if fill_strategy == 'interpolate':
+        lookahead = max(1, buffer_rows // 2)
+        if fill_limit is None or fill_limit > lookahead:
+            logger.info(f"Interpolating gaps of up to {lookahead} rows")
+            fill_limit = lookahead
+    carry_rows = max_window + max_after + lookahead
+    if buffer_rows <= carry_rows:
+        logger.warning(f"Memory budget allows {buffer_rows} rows per chunk; "
+                       f"buffers will hold up to {carry_rows + 1}")
+    chunk_rows = max(1, buffer_rows - carry_rows)
+
+    aggregates = RunningAggregates()
+    os.makedirs(output_dir, exist_ok=True)
+    for directory in chunk_directories(output_dir):
+        shutil.rmtree(directory)
+
+    carry = None      # (dates, ridership, recovery) of rows kept from earlier chunks
+    written = 0       # leading rows of carry that were already written
+    seeds = {name: (np.full(len(MODES), np.nan), np.ones(len(MODES), dtype=np.int64))
+             for name in ('Ridership', 'Recovery')}
+    n_chunks = 0
+
+    def flush(dates, blocks, lo, hi):
+        nonlocal n_chunks
+        emitted_dates = dates[lo:hi]
+        frame = build_long_frame(emitted_dates, {name: block[lo:hi] for name, block in blocks.items()})
+        # Aggregate the stored (compact) values, as a full in-memory run would
+        aggregates.update(emitted_dates, {name: long_to_wide(frame[name].to_numpy(), len(MODES))
+                                          for name in SUMMARY_COLUMNS})
+        save_frame_bundle(
+            frame,
+            os.path.join(output_dir, f"chunk{n_chunks:05d}"),
+            metadata={'first_date': str(emitted_dates[0]), 'last_date': str(emitted_dates[-1])}
+        )
+        n_chunks += 1
+
+    reader = pd.read_csv(filepath, parse_dates=['Date'], chunksize=chunk_rows)
+    for position, chunk in enumerate(reader):
+        dates, ridership, recovery = extract_wide_blocks(chunk)
+        recovery = recovery / 100
+        if carry is not None and len(carry[0]) and dates[0] <= carry[0][-1]:
+            # Chunks are only sorted within themselves
+            raise ValueError("Chunked processing needs a source CSV in ascending date order")
+        if carry is not None:
+            dates = carry[0].append(dates)
+            ridership = np.vstack([carry[1], ridership])
+            recovery = np.vstack([carry[2], recovery])
+        n = len(dates)
+        blocks = derive_blocks(ridership, recovery, fill_strategy, fill_limit, seeds)
+        valid = {'Ridership': blocks['Ridership_Observed'], 'Recovery': blocks['Recovery_Observed']}
+
+        # Rows are settled once their filled values, and those their
+        # centered windows read, can't change with later rows
+        filled = n
+        if fill_strategy == 'interpolate':
+            filled = min(_filled_rows(valid[name], seeds[name], fill_limit) for name in seeds)
+        stop = max(written, filled - max_after)
+        if stop > written:
+            flush(dates, blocks, written, stop)
+
+        # Keep a window of history before the unsettled rows; observations
+        # before it live on in the seeds
+        keep = max(0, stop - max_window)
+        raw = {'Ridership': ridership, 'Recovery': recovery}
+        seeds = {name: _advance_seed(seeds[name], raw[name], valid[name], keep) for name in seeds}
+        carry = (dates[keep:], ridership[keep:], recovery[keep:])
+        written = stop - keep
+        logger.debug(f"Chunk {position}: {n} rows buffered, {len(carry[0]) - written} pending")
+
+    if carry is not None and len(carry[0]) > written:
+        dates, ridership, recovery = carry
+        blocks = derive_blocks(ridership, recovery, fill_strategy, fill_limit, seeds)
+        flush(dates, blocks, written, len(dates))
+
+    logger.info(f"Wrote {n_chunks} chunk bundles to {output_dir} ({chunk_rows} source rows per chunk)")
+    return aggregates
+
+
+def chunk_directories(output_dir):
+    """Chunk bundle directories in date order."""
+    return sorted(glob.glob(os.path.join(output_dir, 'chunk[0-9]*')))
+
+
+def iter_chunks(output_dir, mmap_mode='r'):
+    """Yield the processed long-format frame of each chunk, memory-mapped by default."""
+    for directory in chunk_directories(output_dir):
+        yield load_frame_bundle(directory, mmap_mode=mmap_mode)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process a large ridership CSV in fixed-memory chunks")
+    parser.add_argument('csv', help="Wide-format source CSV")
+    parser.add_argument('output_dir', help="Directory for the per-chunk columnar bundles")
+    parser.add_argument('--memory-mb', type=int, default=DEFAULT_MEMORY_BUDGET // (1024 * 1024),
+                        help="Approximate memory budget for one chunk")
+    parser.add_argument('--fill-strategy', default='ffill', help="ffill, interpolate or mask")
+    parser.add_argument('--fill-limit', type=int, default=None)
+    args = parser.parse_args()
+
+    aggregates = stream_process_csv(args.csv, args.output_dir, args.memory_mb * 1024 * 1024,
+                                    args.fill_strategy, args.fill_limit)
+    print(aggregates.summary_stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+# On-disk columnar cache for the processed ridership dataset.
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join('data', '.cache')
+MANIFEST_NAME = 'manifest.json'
+
+
+def _hash_file(filepath, chunk_size=1 << 20):
+    """Return the sha256 hex digest of a file, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(filepath, cache_dir=DEFAULT_CACHE_DIR):
+    """Fingerprint the source CSV by size, mtime and content hash.
+
+    The hash of the last seen (size, mtime) pair is remembered next to the
+    cache so unchanged files are not re-hashed on every start.
+    """
+    stat = os.stat(filepath)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    index_path = os.path.join(cache_dir, f"{os.path.basename(filepath)}.fingerprint.json")
+    try:
+        with open(index_path) as f:
+            known = json.load(f)
+        if known.get('size') == stat.st_size and known.get('mtime_ns') == stat.st_mtime_ns:
+            fingerprint['sha256'] = known['sha256']
+            return fingerprint
+    except (OSError, ValueError, KeyError):
+        pass
+
+    fingerprint['sha256'] = _hash_file(filepath)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _atomic_write_json(index_path, fingerprint)
+    except OSError as e:
+        logger.warning(f"Could not record source fingerprint: {str(e)}")
+    return fingerprint
+
+
+def bundle_path(filepath, fingerprint, version, cache_dir=DEFAULT_CACHE_DIR):
+    """Directory holding the processed bundle for a given source and processing version."""
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    return os.path.join(cache_dir, f"{stem}-v{version}-{fingerprint['sha256'][:16]}")
+
+
+def _atomic_write_json(path, payload):
+    """Write JSON next to its final location and rename it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def save_frame_bundle(df, directory, metadata=None, arrays=None):
+    """Write a DataFrame as one .npy file per column plus a JSON manifest.
+
+    arrays holds extra named numpy arrays (e.g. precomputed aggregates) to
+    store alongside, read back with load_bundle_arrays. The bundle is
+    assembled in a temporary directory and renamed into place, so concurrent
+    readers only ever see complete bundles.
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+
+    try:
+        columns = []
+        for i, name in enumerate(df.columns):
+            series = df[name]
+            entry = {'name': name, 'file': f"col{i:03d}.npy"}
+
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                entry['kind'] = 'category'
+                entry['categories'] = [str(c) for c in series.cat.categories]
+                values = series.cat.codes.to_numpy()
+            elif series.dtype == object:
+                entry['kind'] = 'object'
+                values = series.to_numpy().astype(str)
+            else:
+                entry['kind'] = 'array'
+                values = series.to_numpy()
+
+            np.save(os.path.join(tmp_dir, entry['file']), values, allow_pickle=False)
+            columns.append(entry)
+
+        array_files = {}
+        for i, (name, values) in enumerate((arrays or {}).items()):
+            array_files[name] = f"arr{i:03d}.npy"
+            np.save(os.path.join(tmp_dir, array_files[name]), np.asarray(values), allow_pickle=False)
+
+        manifest = {'rows': len(df), 'columns': columns, 'arrays': array_files,
+                    'metadata': metadata or {}}
+        with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f)
+
+        try:
+            os.rename(tmp_dir, directory)
+        except OSError:
+            # Another process published the same bundle first; keep theirs
+            if not os.path.exists(os.path.join(directory, MANIFEST_NAME)):
+                raise
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def read_bundle_manifest(directory):
+    """Return the manifest of a bundle, or None if the bundle is absent or incomplete."""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_frame_bundle(directory, mmap_mode=None):
+    """Load a bundle written by save_frame_bundle back into a DataFrame."""
+    manifest = read_bundle_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No complete bundle at {directory}")
+
+    data = {}
+    for entry in manifest['columns']:
+        values = np.load(os.path.join(directory, entry['file']),
+                         mmap_mode=mmap_mode, allow_pickle=False)
+        if entry['kind'] == 'category':
+            data[entry['name']] = pd.Categorical.from_codes(values, entry['categories'])
+        elif entry['kind'] == 'object':
+            data[entry['name']] = values.astype(object)
+        else:
+            data[entry['name']] = values
+
+    return pd.DataFrame(data, copy=False)
+
+
+def load_bundle_arrays(directory, mmap_mode=None):
+    """Extra arrays saved with a bundle, by name (empty if it has none)."""
+    manifest = read_bundle_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No complete bundle at {directory}")
+
+    return {name: np.load(os.path.join(directory, file), mmap_mode=mmap_mode, allow_pickle=False)
+            for name, file in manifest.get('arrays', {}).items()}
@@ -5,26 +5,160 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import hashlib
+import io
 import logging
+import os
+
+from scripts.data_cache import (
+    DEFAULT_CACHE_DIR,
+    bundle_path,
+    load_bundle_arrays,
+    load_frame_bundle,
+    read_bundle_manifest,
+    save_frame_bundle,
+    source_fingerprint
+)
+from scripts.gap_filling import FILL_STRATEGIES, fill_gaps
+from scripts.schema import apply_schema, memory_report
+from scripts.reshape import (
+    MODES, extract_wide_blocks, long_to_wide, sort_by_date, wide_to_long, wide_to_long_column
+)
+from scripts.dataset_snapshot import SNAPSHOT_FIELDS, DatasetSnapshot
+from scripts.distributions import weekday_weekend_summaries
+from scripts.rollups import PeriodRollups
+from scripts.stats_cube import SummaryCube
+from scripts.timeline_events import DEFAULT_EVENTS_PATH, TimelineEvents
+from scripts.window_stats import WINDOW_SPECS, compute_window_stats
+from scripts.yearly_alignment import YearlyAlignment
+
+DEFAULT_DATA_PATH = os.path.join('data', 'MTA_Daily_Ridership.csv')
+
+# Bump whenever process_data changes its output, so stale caches are ignored
+PROCESSING_VERSION = 6
+
+# Block size for re-hashing the consumed source, to tell an appended CSV
+# from a rewritten or revised one
+SOURCE_HASH_BLOCK = 1 << 20
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def derive_blocks(ridership, recovery, fill_strategy='ffill', fill_limit=None, seeds=None):
+    """Gap-filled values, derived metrics and rolling windows as (dates x modes) blocks.
+
+    recovery is a fraction (the CSV's percentage / 100). seeds optionally
+    maps 'Ridership' and 'Recovery' to the gap-filling seed of each block
+    (the last observations before it, see gap_filling.forward_fill).
+    """
+    seeds = seeds or {}
+    # Handle missing values per mode, so gaps never borrow another
+    # mode's values, and keep the validity bitmaps of reported cells
+    ridership, ridership_observed = fill_gaps(ridership, fill_strategy, fill_limit, seeds.get('Ridership'))
+    recovery, recovery_observed = fill_gaps(recovery, fill_strategy, fill_limit, seeds.get('Recovery'))
+    
+    # Add derived metrics
+    with np.errstate(invalid='ignore', divide='ignore'):
+        baseline = ridership / recovery
+    
+    # Add rolling averages for every mode in one pass over the blocks,
+    # so charts don't recompute them
+    windows = compute_window_stats({
+        'Ridership': ridership,
+        'Recovery_Percentage': recovery
+    })
+    
+    return {
+        'Ridership': ridership,
+        'Recovery_Percentage': recovery,
+        'Pre_Pandemic_Baseline': baseline,
+        **windows,
+        'Ridership_Observed': ridership_observed,
+        'Recovery_Observed': recovery_observed
+    }
+
+def build_long_frame(dates, blocks):
+    """Long-format processed frame from the blocks returned by derive_blocks.
+
+    Columns are cast to the compact dtypes of PROCESSED_SCHEMA.
+    """
+    processed_df = wide_to_long(dates, MODES, {
+        'Ridership': blocks['Ridership'],
+        'Recovery_Percentage': blocks['Recovery_Percentage']
+    })
+    for name, block in blocks.items():
+        if name not in processed_df:
+            processed_df[name] = wide_to_long_column(block)
+    return apply_schema(processed_df)
+
+class _SnapshotAttribute:
+    """Read-only view of a field of the current snapshot (MTARidershipData.snapshot)."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, data, owner=None):
+        if data is None:
+            return self
+        return getattr(data.snapshot, self.name)
+
+
 class MTARidershipData:
-    """Class to handle MTA ridership data processing and transformations."""
+    """Class to handle MTA ridership data processing and transformations.
+
+    The served data lives in an immutable DatasetSnapshot, replaced as a
+    whole whenever it changes. Its fields are also readable as attributes
+    (processed_data, stats_cube, ...), but those read whatever snapshot is
+    current; requests that combine several should read snapshot once.
+    """
+
+    processed_data = _SnapshotAttribute()
+    timeline_events = _SnapshotAttribute()
+    # Aggregates served alongside processed_data (see _summaries)
+    stats_cube = _SnapshotAttribute()
+    rollups = _SnapshotAttribute()
+    recovery_distributions = _SnapshotAttribute()
+    yearly_alignment = _SnapshotAttribute()
+    # Identifies the processed dataset (source hash + processing options)
+    # while it matches a bundle loaded from or saved to the cache, else None
+    dataset_version = _SnapshotAttribute()
+    # Incremented each time new data replaces the processed dataset
+    revision = _SnapshotAttribute()
+    # sha256 of the part of the source CSV the processed data covers
+    source_digest = _SnapshotAttribute()
+    # Index of processed_data for mode and date-range selections (RidershipStore)
+    store = _SnapshotAttribute()
     
-    def __init__(self, filepath):
-        """Initialize with filepath to CSV data."""
+    def __init__(self, filepath, cache_dir=DEFAULT_CACHE_DIR, fill_strategy='ffill', fill_limit=None,
+                 events_path=DEFAULT_EVENTS_PATH):
+        """Initialize with filepath to CSV data.
+
+        fill_strategy is one of 'ffill', 'interpolate' or 'mask' (leave gaps as
+        NaN); fill_limit caps how many consecutive missing days are imputed.
+        events_path is the timeline events file (CSV or JSON).
+        """
+        if fill_strategy not in FILL_STRATEGIES:
+            raise ValueError(f"Unknown fill strategy '{fill_strategy}'")
         self.filepath = filepath
+        self.cache_dir = cache_dir
+        self.fill_strategy = fill_strategy
+        self.fill_limit = fill_limit
+        self.events_path = events_path
         self.raw_data = None
-        self.processed_data = None
-        self.timeline_events = None
+        self.snapshot = DatasetSnapshot()
+        # How much of the source CSV the processed data covers, for ingest_new_rows
+        self._source_offset = None
+        self._source_digest = None
+        self._mmap = False
         
     def load_raw_data(self):
         """Load raw data from CSV file."""
         try:
-            self.raw_data = pd.read_csv(self.filepath, parse_dates=['Date'])
+            with open(self.filepath, 'rb') as f:
+                content = f.read()
+            self.raw_data = pd.read_csv(io.BytesIO(content), parse_dates=['Date'])
+            self._remember_source_position(len(content), hashlib.sha256(content).hexdigest())
             logger.info(f"Successfully loaded data with {len(self.raw_data)} rows")
             return True
         except Exception as e:
@@ -38,70 +172,322 @@ class MTARidershipData:
             return False
         
         try:
-            df = self.raw_data.copy()
+            # 1. Split the wide table into (dates x modes) blocks
+            dates, ridership, recovery = extract_wide_blocks(self.raw_data)
             
-            # 1. Reshape data from wide to long format
-            id_vars = ['Date']
-            value_vars = [
-                ('Subways: Total Estimated Ridership', 'Subways: % of Comparable Pre-Pandemic Day'),
-                ('Buses: Total Estimated Ridership', 'Buses: % of Comparable Pre-Pandemic Day'),
-                ('LIRR: Total Estimated Ridership', 'LIRR: % of Comparable Pre-Pandemic Day'),
-                ('Metro-North: Total Estimated Ridership', 'Metro-North: % of Comparable Pre-Pandemic Day'),
-                ('Access-A-Ride: Total Scheduled Trips', 'Access-A-Ride: % of Comparable Pre-Pandemic Day'),
-                ('Bridges and Tunnels: Total Traffic', 'Bridges and Tunnels: % of Comparable Pre-Pandemic Day'),
-                ('Staten Island Railway: Total Estimated Ridership', 'Staten Island Railway: % of Comparable Pre-Pandemic Day')
-            ]
-            
-            # Create empty lists to store transformed data
-            transformed_data = []
-            
-            # Process each pair of columns
-            for ridership_col, percentage_col in value_vars:
-                mode = ridership_col.split(':')[0].strip()
-                mode_data = pd.DataFrame({
-                    'Date': df['Date'],
-                    'Mode': mode,
-                    'Ridership': df[ridership_col],
-                    'Recovery_Percentage': df[percentage_col]
-                })
-                transformed_data.append(mode_data)
-            
-            # Combine all transformed data
-            processed_df = pd.concat(transformed_data, ignore_index=True)
-            
-            # 2. Add temporal features
-            processed_df['Year'] = processed_df['Date'].dt.year
-            processed_df['Month'] = processed_df['Date'].dt.month
-            processed_df['DayOfWeek'] = processed_df['Date'].dt.dayofweek
-            processed_df['IsWeekend'] = processed_df['DayOfWeek'].isin([5, 6])
-            
-            # 3. Clean and validate data
+            # 2-4. Clean the blocks and add derived metrics and rolling averages
             # Convert percentages to proper decimals
-            processed_df['Recovery_Percentage'] = processed_df['Recovery_Percentage'].astype(float) / 100
-            
-            # Handle missing values
-            processed_df['Ridership'] = processed_df['Ridership'].ffill()
-            processed_df['Recovery_Percentage'] = processed_df['Recovery_Percentage'].ffill()
+            blocks = derive_blocks(ridership, recovery / 100, self.fill_strategy, self.fill_limit)
             
-            # 4. Add derived metrics
-            processed_df['Pre_Pandemic_Baseline'] = (processed_df['Ridership'] / 
-                                                   processed_df['Recovery_Percentage'])
-            
-            # 5. Add rolling averages
-            processed_df['Ridership_7day_MA'] = (processed_df.groupby('Mode')['Ridership']
-                                               .transform(lambda x: x.rolling(7, min_periods=1).mean()))
+            # 5. Reshape to long format, with temporal features computed once per date
+            processed_df = build_long_frame(dates, blocks)
             
             # Add timeline events after processing
             self.add_timeline_events()
             
-            self.processed_data = processed_df
-            logger.info("Data processing completed successfully")
+            self._swap(processed_data=processed_df, dataset_version=None,
+                       source_digest=self._source_digest, **self._summaries(processed_df))
+            logger.info(f"Data processing completed successfully "
+                        f"({memory_report(processed_df).loc['Total', 'bytes'] / 1e6:.1f} MB)")
             return True
             
         except Exception as e:
             logger.error(f"Error processing data: {str(e)}")
             return False
     
+    @staticmethod
+    def _summaries(frame, cube=None):
+        """Aggregates precomputed from a processed frame, by attribute name.
+
+        The cube is built from the stored (compact) values, so it matches
+        one rebuilt from the cache.
+        """
+        if cube is None:
+            cube = SummaryCube.from_frame(frame)
+        return {
+            'stats_cube': cube,
+            'rollups': PeriodRollups(cube),
+            'recovery_distributions': weekday_weekend_summaries(frame),
+            'yearly_alignment': YearlyAlignment.from_frame(frame)
+        }
+    
+    def _cache_version(self):
+        """Cache key component covering the processing code and its options."""
+        limit = '' if self.fill_limit is None else self.fill_limit
+        return f"{PROCESSING_VERSION}-{self.fill_strategy}{limit}"
+    
+    def load_processed_cache(self, mmap=False):
+        """Load processed data from the on-disk cache if it matches the source CSV.
+
+        With mmap=True the column files are memory-mapped read-only, so every
+        process attaching to the same bundle shares one copy in the page cache.
+        The same goes for the summary cube saved with it.
+        """
+        if self.cache_dir is None:
+            return False
+
+        try:
+            fingerprint = source_fingerprint(self.filepath, self.cache_dir)
+            directory = bundle_path(self.filepath, fingerprint, self._cache_version(), self.cache_dir)
+            manifest = read_bundle_manifest(directory)
+            if manifest is None or manifest['metadata'].get('source') != fingerprint['sha256']:
+                return False
+
+            processed_df = load_frame_bundle(directory, mmap_mode='r' if mmap else None)
+            arrays = load_bundle_arrays(directory, mmap_mode='r' if mmap else None)
+            cube = None
+            if arrays:
+                cube = SummaryCube.from_arrays(processed_df['Mode'].cat.categories, arrays)
+            self.add_timeline_events()
+            self._swap(processed_data=processed_df, dataset_version=os.path.basename(directory),
+                       source_digest=fingerprint['sha256'], _source_offset=fingerprint['size'],
+                       _source_digest=fingerprint['sha256'], **self._summaries(processed_df, cube))
+            logger.info(f"Loaded processed data from cache ({len(self.processed_data)} rows, "
+                        f"{'memory-mapped' if mmap else 'in memory'})")
+            return True
+        except Exception as e:
+            logger.warning(f"Ignoring processed data cache: {str(e)}")
+            return False
+
+    def save_processed_cache(self):
+        """Persist processed data so later starts can skip parsing and processing."""
+        if self.cache_dir is None or self.processed_data is None:
+            return False
+
+        try:
+            fingerprint = source_fingerprint(self.filepath, self.cache_dir)
+            # Only a source whose bytes were all processed can be cached under its fingerprint
+            if (fingerprint['size'], fingerprint['sha256']) != (self._source_offset, self._source_digest):
+                logger.info("Source CSV changed since it was processed; not caching it")
+                return False
+            directory = bundle_path(self.filepath, fingerprint, self._cache_version(), self.cache_dir)
+            if read_bundle_manifest(directory) is None:
+                save_frame_bundle(self.processed_data, directory,
+                                  metadata={'source': fingerprint['sha256']},
+                                  arrays=self.stats_cube.to_arrays())
+                logger.info(f"Saved processed data cache to {directory}")
+            self._swap(dataset_version=os.path.basename(directory))
+            return True
+        except Exception as e:
+            logger.warning(f"Could not save processed data cache: {str(e)}")
+            return False
+
+    def load(self, mmap=False):
+        """Load processed data, from cache when fresh, otherwise from the CSV."""
+        self._mmap = mmap
+        if self.load_processed_cache(mmap=mmap):
+            return True
+
+        if not (self.load_raw_data() and self.process_data()):
+            return False
+
+        self._save_and_share()
+        return True
+
+    def _save_and_share(self):
+        """Save the processed data to the cache; a memory-mapped instance then
+        re-attaches to the saved bundle.
+
+        Otherwise it would keep the data it just built as a private copy, and
+        each process would hold its own after the first ingest.
+        """
+        if self.save_processed_cache() and self._mmap and self.load_processed_cache(mmap=True):
+            # As when loaded from the cache to begin with
+            self._swap(raw_data=None)
+
+    def _remember_source_position(self, offset, digest):
+        """Record that the processed data covers the first `offset` bytes of the source,
+        whose sha256 is `digest`."""
+        self._source_offset = offset
+        self._source_digest = digest
+    
+    def _read_appended_rows(self):
+        """Parse the complete lines appended to the source since it was last read.
+
+        The bytes already processed are re-hashed, so rows revised anywhere
+        in them are noticed. Returns (rows, bytes consumed, sha256 of the
+        source up to the consumed bytes), or None if the file no longer
+        starts with the content already processed.
+        """
+        digest = hashlib.sha256()
+        with open(self.filepath, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if self._source_offset is None or f.tell() < self._source_offset:
+                return None
+            f.seek(0)
+            header = f.readline()
+            f.seek(0)
+            remaining = self._source_offset
+            while remaining > 0:
+                block = f.read(min(SOURCE_HASH_BLOCK, remaining))
+                if not block:
+                    return None
+                digest.update(block)
+                remaining -= len(block)
+            if digest.hexdigest() != self._source_digest:
+                return None
+            appended = f.read()
+        
+        # A row still being written is left for the next call
+        appended = appended[:appended.rfind(b'\n') + 1]
+        digest.update(appended)
+        if not appended.strip():
+            return pd.DataFrame(), len(appended), digest.hexdigest()
+        rows = pd.read_csv(io.BytesIO(header + appended), parse_dates=['Date'])
+        return rows, len(appended), digest.hexdigest()
+    
+    def reload(self):
+        """Load the source in full into a new instance and swap it in as the next revision."""
+        fresh = MTARidershipData(self.filepath, cache_dir=self.cache_dir,
+                                 fill_strategy=self.fill_strategy, fill_limit=self.fill_limit,
+                                 events_path=self.events_path)
+        if not fresh.load(mmap=self._mmap):
+            return False
+        state = {name: value for name, value in vars(fresh).items() if name != 'snapshot'}
+        state.update({name: getattr(fresh.snapshot, name) for name in SNAPSHOT_FIELDS})
+        self._swap(**{**state, 'revision': self.revision + 1})
+        return True
+    
+    def covers_source(self):
+        """True if the processed data accounts for every byte of the source CSV.
+
+        False while a row is still being written (ingest_new_rows leaves it
+        for later).
+        """
+        try:
+            return os.path.getsize(self.filepath) == self._source_offset
+        except OSError:
+            return False
+    
+    def ingest_new_rows(self):
+        """Append rows added to the end of the source CSV since it was last read.
+
+        Only the appended bytes are parsed, and only dates after the last
+        processed one are kept. Gap filling, rolling windows and the summary
+        cube are recomputed for the affected tail, then published together
+        as a new snapshot.
+        Falls back to a full reload when the file was rewritten. Callers
+        hand their caches over to the new snapshot
+        (visualization.initialize_cache_arrays) when revision changes.
+        """
+        if self.processed_data is None:
+            logger.error("No processed data available")
+            return False
+        
+        try:
+            appended = self._read_appended_rows()
+            if appended is None:
+                logger.info("Source CSV was rewritten; reloading it in full")
+                return self.reload()
+            
+            rows, consumed, digest = appended
+            cube = self.stats_cube
+            if not rows.empty:
+                rows = sort_by_date(rows[rows['Date'] > pd.Timestamp(cube.dates[-1])])
+            if rows.empty:
+                self._remember_source_position(self._source_offset + consumed, digest)
+                return True
+            
+            frame, first_changed = self._append_blocks(rows)
+            dates = pd.DatetimeIndex(np.concatenate([cube.dates, rows['Date'].to_numpy()]))
+            new_cube = cube.updated(first_changed, dates,
+                                    long_to_wide(frame['Ridership'].to_numpy(), len(MODES)),
+                                    long_to_wide(frame['Recovery_Percentage'].to_numpy(), len(MODES)))
+            
+            raw_data = self.raw_data
+            if raw_data is not None:
+                raw_data = pd.concat([raw_data, rows], ignore_index=True)
+            # The new data has no bundle until save_processed_cache writes one
+            # (it doesn't while the source ends in a partial row), so it
+            # mustn't keep the previous bundle's version
+            self._swap(processed_data=frame, raw_data=raw_data, revision=self.revision + 1,
+                       dataset_version=None, source_digest=digest,
+                       _source_offset=self._source_offset + consumed, _source_digest=digest,
+                       **self._summaries(frame, new_cube))
+            self._save_and_share()
+            logger.info(f"Ingested {len(rows)} new dates (recomputed from row {first_changed})")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error ingesting new rows: {str(e)}")
+            return False
+    
+    def _swap(self, **state):
+        """Update the instance's own state, then publish the snapshot fields in state.
+
+        The fields are published as a new snapshot built from the current
+        one, with one reference assignment: readers of either snapshot never
+        see a mix of versions.
+        """
+        fields = {name: state.pop(name) for name in SNAPSHOT_FIELDS if name in state}
+        self.__dict__.update(state)
+        if fields:
+            self.snapshot = self.snapshot.replace(**fields)
+    
+    def _append_blocks(self, rows):
+        """Processed frame with `rows` appended, and the first recomputed row.
+
+        Rows before the earliest date whose filled value or rolling window
+        can depend on the new dates are copied from the current frame; the
+        rest is recomputed from the raw (observed) values.
+        """
+        frame = self.processed_data
+        n_modes = len(MODES)
+        current = {name: long_to_wide(frame[name].to_numpy(), n_modes)
+                   for name in frame.columns
+                   if name not in ('Date', 'Mode', 'Year', 'Month', 'DayOfWeek', 'IsWeekend')}
+        n_old = current['Ridership'].shape[0]
+        
+        new_dates, new_ridership, new_recovery = extract_wide_blocks(rows)
+        raw = {
+            'Ridership': np.vstack([
+                np.where(current['Ridership_Observed'], current['Ridership'], np.nan),
+                new_ridership
+            ]),
+            'Recovery_Percentage': np.vstack([
+                np.where(current['Recovery_Observed'], current['Recovery_Percentage'], np.nan),
+                new_recovery / 100
+            ])
+        }
+        
+        # Cells after each mode's last observed value are the only ones whose
+        # imputed value can change; windows reach at most max_window rows
+        last_observed = {
+            name: np.where(values[:n_old].any(axis=0),
+                           n_old - 1 - np.argmax(values[:n_old][::-1], axis=0), 0)
+            for name, values in (('Ridership', current['Ridership_Observed']),
+                                 ('Recovery_Percentage', current['Recovery_Observed']))
+        }
+        max_window = max(window for _, window, _, _ in WINDOW_SPECS.values())
+        first_changed = int(max(0, min(n_old, *(last.min() for last in last_observed.values()))
+                                - max_window))
+        context = max(0, first_changed - max_window)
+        
+        tail = derive_blocks(raw['Ridership'][first_changed:], raw['Recovery_Percentage'][first_changed:],
+                             self.fill_strategy, self.fill_limit)
+        # Keep earlier imputations: cells before a mode's last observed value
+        # are final, and refilling them from a shorter history could differ
+        row_numbers = np.arange(first_changed, len(raw['Ridership']))[:, None]
+        for name, last in last_observed.items():
+            previous = np.vstack([current[name][first_changed:],
+                                  np.full((len(rows), n_modes), np.nan)])
+            tail[name] = np.where(row_numbers < last, previous, tail[name])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tail['Pre_Pandemic_Baseline'] = tail['Ridership'] / tail['Recovery_Percentage']
+        
+        # Windows at first_changed need up to max_window earlier rows
+        windows = compute_window_stats({
+            name: np.vstack([current[name][context:first_changed], tail[name]])
+            for name in ('Ridership', 'Recovery_Percentage')
+        })
+        for name, block in windows.items():
+            tail[name] = block[first_changed - context:]
+        
+        blocks = {name: np.vstack([current[name][:first_changed], tail[name]])
+                  for name in current}
+        dates = pd.DatetimeIndex(np.concatenate([frame['Date'].to_numpy()[:n_old], new_dates.to_numpy()]))
+        return build_long_frame(dates, blocks), first_changed
+    
     def get_mode_data(self, mode):
         """Get data for a specific transportation mode."""
         if self.processed_data is None:
@@ -119,13 +505,32 @@ class MTARidershipData:
         mask = (self.processed_data['Date'] >= start_date) & (self.processed_data['Date'] <= end_date)
         return self.processed_data[mask]
     
-    def get_summary_stats(self):
-        """Generate summary statistics for each mode."""
+    def memory_report(self):
+        """Per-column memory use and dtypes of the processed frame."""
         if self.processed_data is None:
             logger.error("No processed data available")
             return None
         
-        summary = self.processed_data.groupby('Mode').agg({
+        return memory_report(self.processed_data)
+    
+    def get_summary_stats(self, observed_only=False):
+        """Generate summary statistics for each mode.
+        
+        With observed_only=True, imputed cells are left out using the
+        validity bitmaps recorded during processing.
+        """
+        if self.processed_data is None:
+            logger.error("No processed data available")
+            return None
+        
+        df = self.processed_data
+        if observed_only:
+            df = df.assign(
+                Ridership=df['Ridership'].where(df['Ridership_Observed']),
+                Recovery_Percentage=df['Recovery_Percentage'].where(df['Recovery_Observed'])
+            )
+        
+        summary = df.groupby('Mode', observed=True).agg({
             'Ridership': ['mean', 'min', 'max'],
             'Recovery_Percentage': ['mean', 'min', 'max'],
             'Pre_Pandemic_Baseline': ['mean']
@@ -135,73 +540,17 @@ class MTARidershipData:
     
     
     def add_timeline_events(self):
-        """Add enhanced timeline events with detailed context and impact analysis"""
-        timeline_events = [
-            {
-                'date': '2020-03-01',
-                'event': 'First COVID-19 Case in NYC',
-                'category': 'health',
-                'impact_level': 'critical',
-                'description': 'First confirmed COVID-19 case in New York City',
-                'ridership_impact': 'immediate decline',
-                'phase': 'initial'
-            },
-            {
-                'date': '2020-03-22',
-                'event': 'NY PAUSE Program',
-                'category': 'policy',
-                'impact_level': 'critical',
-                'description': 'Governor Cuomo announces NY PAUSE',
-                'ridership_impact': 'severe decline',
-                'phase': 'lockdown'
-            },
-            {
-                'date': '2020-06-08',
-                'event': 'Phase 1 Reopening',
-                'category': 'policy',
-                'impact_level': 'major',
-                'description': 'NYC begins Phase 1 reopening',
-                'ridership_impact': 'gradual increase',
-                'phase': 'early_recovery'
-            },
-            {
-                'date': '2020-09-09',
-                'event': 'Indoor Dining Resumes',
-                'category': 'policy',
-                'impact_level': 'moderate',
-                'description': 'Indoor dining at 25% capacity',
-                'ridership_impact': 'moderate increase',
-                'phase': 'adaptation'
-            },
-            {
-                'date': '2020-12-14',
-                'event': 'First Vaccine in NYC',
-                'category': 'health',
-                'impact_level': 'major',
-                'description': 'First COVID-19 vaccine administered',
-                'ridership_impact': 'positive outlook',
-                'phase': 'recovery'
-            },
-            {
-                'date': '2021-05-19',
-                'event': 'Major Reopening',
-                'category': 'policy',
-                'impact_level': 'major',
-                'description': 'Most capacity restrictions lifted',
-                'ridership_impact': 'significant increase',
-                'phase': 'late_recovery'
-            },
-            {
-                'date': '2021-09-13',
-                'event': 'Schools Fully Reopen',
-                'category': 'policy',
-                'impact_level': 'major',
-                'description': 'NYC public schools fully reopen',
-                'ridership_impact': 'sustained increase',
-                'phase': 'new_normal'
-            }
-        ]
-        
-        self.timeline_events = pd.DataFrame(timeline_events)
-        self.timeline_events['date'] = pd.to_datetime(self.timeline_events['date'])
+        """Load the timeline events (see scripts/timeline_events.py), once per instance
+
+        A missing or malformed events file leaves the charts without events
+        rather than failing the data load.
+        """
+        if self.timeline_events is None:
+            try:
+                events = TimelineEvents.from_file(self.events_path)
+                logger.info(f"Loaded {len(events)} timeline events")
+            except Exception as e:
+                logger.warning(f"Ignoring timeline events: {str(e)}")
+                events = TimelineEvents.empty()
+            self._swap(timeline_events=events)
         return self.timeline_events
@@ -0,0 +1,85 @@
+# Indexed access to the processed long-format ridership frame.
+
+import numpy as np
+import pandas as pd
+
+
+def _to_datetime64(value):
+    """Normalise a date-like value (string, Timestamp, datetime) to datetime64[ns]."""
+    return pd.Timestamp(value).to_datetime64().astype('datetime64[ns]')
+
+
+class RidershipStore:
+    """Processed data laid out as contiguous per-mode blocks with sorted date indexes.
+
+    Selecting modes slices their blocks and a date range is a searchsorted
+    bisection inside each block, so the cost of a selection is proportional
+    to the rows it returns rather than to the size of the dataset.
+    """
+
+    def __init__(self, frame):
+        """Index a processed frame; rows are reordered by (Mode, Date) if needed."""
+        mode_values = frame['Mode']
+        if not isinstance(mode_values.dtype, pd.CategoricalDtype):
+            mode_values = mode_values.astype('category')
+        codes = mode_values.cat.codes.to_numpy()
+        dates = frame['Date'].to_numpy()
+
+        # The processed frame is already mode-major and date-sorted within
+        # each mode; only fall back to sorting for frames built elsewhere
+        in_order = (np.all(np.diff(codes) >= 0) and
+                    np.all((np.diff(dates) >= np.timedelta64(0)) | (np.diff(codes) > 0)))
+        if not in_order:
+            order = np.lexsort((dates, codes))
+            frame = frame.take(order)
+            codes = codes[order]
+            dates = dates[order]
+
+        self.frame = frame
+        self.dates = dates
+        self._date_bounds = None
+        self.blocks = {}
+        boundaries = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate([[0], boundaries])
+        stops = np.concatenate([boundaries, [len(codes)]])
+        categories = mode_values.cat.categories
+        for start, stop in zip(starts, stops):
+            if stop > start:
+                self.blocks[categories[codes[start]]] = (int(start), int(stop))
+
+    @property
+    def modes(self):
+        """Modes in block order."""
+        return list(self.blocks)
+
+    def _row_range(self, mode, start_date=None, end_date=None):
+        """Row slice of one mode's block restricted to [start_date, end_date]."""
+        start, stop = self.blocks[mode]
+        block_dates = self.dates[start:stop]
+        lo = 0 if start_date is None else np.searchsorted(block_dates, _to_datetime64(start_date), 'left')
+        hi = stop - start if end_date is None else np.searchsorted(block_dates, _to_datetime64(end_date), 'right')
+        return start + int(lo), start + int(hi)
+
+    def select(self, modes, start_date=None, end_date=None):
+        """Rows for the given modes within an inclusive date range.
+
+        A single mode returns a view of its block; several modes are
+        concatenated in block order. Unknown modes are ignored.
+        """
+        wanted = set(modes)
+        ranges = [self._row_range(mode, start_date, end_date)
+                  for mode in self.blocks if mode in wanted]
+        ranges = [(lo, hi) for lo, hi in ranges if hi > lo]
+
+        if not ranges:
+            return self.frame.iloc[0:0]
+        if len(ranges) == 1:
+            lo, hi = ranges[0]
+            return self.frame.iloc[lo:hi]
+        return pd.concat([self.frame.iloc[lo:hi] for lo, hi in ranges])
+
+    def date_bounds(self):
+        """Earliest and latest date in the store."""
+        if self._date_bounds is None:
+            self._date_bounds = (pd.Timestamp(self.dates.min()), pd.Timestamp(self.dates.max()))
+        return self._date_bounds
@@ -0,0 +1,43 @@
+# Immutable snapshots of the served dataset, published as one reference.
+
+from scripts.data_store import RidershipStore
+
+# Everything a request reads about the dataset, by attribute name
+SNAPSHOT_FIELDS = (
+    'processed_data', 'timeline_events', 'stats_cube', 'rollups', 'recovery_distributions',
+    'yearly_alignment', 'revision', 'dataset_version', 'source_digest'
+)
+
+
+class DatasetSnapshot:
+    """One version of the processed dataset with the aggregates and index built from it.
+
+    Never modified once built: new data (or a new dataset_version for the
+    same data) makes a new snapshot, published by replacing a single
+    reference (MTARidershipData.snapshot). A request that reads that
+    reference once sees the frame, cube, rollups and store of one version.
+    """
+
+    def __init__(self, processed_data=None, timeline_events=None, stats_cube=None, rollups=None,
+                 recovery_distributions=None, yearly_alignment=None, revision=0,
+                 dataset_version=None, source_digest=None, store=None):
+        if store is None and processed_data is not None:
+            store = RidershipStore(processed_data)
+        fields = dict(processed_data=processed_data, timeline_events=timeline_events,
+                      stats_cube=stats_cube, rollups=rollups,
+                      recovery_distributions=recovery_distributions,
+                      yearly_alignment=yearly_alignment, revision=revision,
+                      dataset_version=dataset_version, source_digest=source_digest, store=store)
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DatasetSnapshot is immutable; use replace()")
+
+    def replace(self, **changes):
+        """Copy with some fields changed; the store is rebuilt only for a new frame."""
+        fields = {name: getattr(self, name) for name in SNAPSHOT_FIELDS}
+        if 'processed_data' not in changes:
+            fields['store'] = self.store
+        fields.update(changes)
+        return DatasetSnapshot(**fields)
@@ -0,0 +1,71 @@
+# Compact distribution summaries (quantiles, mean, KDE curve) for violin-style charts.
+
+import numpy as np
+
+# Points on each KDE curve
+KDE_POINTS = 100
+
+# Larger samples are binned before the KDE, so its cost stops growing with history
+KDE_BINS = 1024
+
+
+def silverman_bandwidth(values):
+    """Gaussian kernel bandwidth by Silverman's rule of thumb, as plotly's violins use."""
+    n = len(values)
+    q1, q3 = np.quantile(values, [0.25, 0.75])
+    std = values.std(ddof=1) if n > 1 else 0.0
+    spread = min(std, (q3 - q1) / 1.349) if q3 > q1 else std
+    if spread == 0:
+        # Constant samples: a narrow kernel relative to the value itself
+        spread = max(abs(values[0]), 1.0) * 1e-3
+    return 0.9 * spread * n ** -0.2
+
+
+def summarize_distribution(values, points=KDE_POINTS):
+    """Count, mean, quartiles and a Gaussian KDE of a sample, or None if it is empty.
+
+    The KDE is evaluated on `points` evenly spaced values spanning the data
+    plus two bandwidths on each side, like plotly's default 'soft' span.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    n = len(values)
+    if n == 0:
+        return None
+
+    bandwidth = silverman_bandwidth(values)
+    quantiles = np.quantile(values, [0, 0.25, 0.5, 0.75, 1])
+    grid = np.linspace(quantiles[0] - 2 * bandwidth, quantiles[-1] + 2 * bandwidth, points)
+
+    centers, weights = values, np.ones(n)
+    if n > KDE_BINS:
+        weights, edges = np.histogram(values, bins=KDE_BINS)
+        centers = (edges[:-1] + edges[1:]) / 2
+    kernel = np.exp(-0.5 * ((grid[:, None] - centers[None, :]) / bandwidth) ** 2)
+    density = (kernel * weights).sum(axis=1) / (n * bandwidth * np.sqrt(2 * np.pi))
+
+    return {
+        'count': n,
+        'mean': values.mean(),
+        'quantiles': quantiles,
+        'grid': grid,
+        'density': density
+    }
+
+
+def weekday_weekend_summaries(frame):
+    """Recovery (in %) distribution summaries per mode, split into weekdays and weekends.
+
+    Returns {mode: {'Weekday': summary, 'Weekend': summary}} in the frame's
+    mode order.
+    """
+    summaries = {}
+    for mode in frame['Mode'].unique():
+        mode_rows = frame[frame['Mode'] == mode]
+        recovery = mode_rows['Recovery_Percentage'].to_numpy() * 100
+        weekend = mode_rows['IsWeekend'].to_numpy()
+        summaries[mode] = {
+            'Weekday': summarize_distribution(recovery[~weekend]),
+            'Weekend': summarize_distribution(recovery[weekend])
+        }
+    return summaries
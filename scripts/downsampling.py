@@ -0,0 +1,31 @@
+# Point reduction for long time-series traces.
+
+import numpy as np
+
+# Points kept per trace: about one per horizontal pixel of a full-width chart
+DEFAULT_MAX_POINTS = 1000
+
+
+def minmax_indices(values, max_points=DEFAULT_MAX_POINTS):
+    """Row indices keeping each bucket's minimum and maximum, plus both endpoints.
+
+    Rows are split into max_points // 2 equal buckets, so spikes and dips
+    survive downsampling. Buckets holding only NaN keep one NaN row, so gaps
+    still break the line. Short series are returned whole.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+
+    size = -(-n // max(1, max_points // 2))
+    n_buckets = -(-n // size)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = values
+    buckets = padded.reshape(n_buckets, size)
+    valid = ~np.isnan(buckets)
+
+    offsets = np.arange(n_buckets) * size
+    lows = offsets + np.argmin(np.where(valid, buckets, np.inf), axis=1)
+    highs = offsets + np.argmax(np.where(valid, buckets, -np.inf), axis=1)
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
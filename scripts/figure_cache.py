@@ -0,0 +1,175 @@
+# Server-side cache of serialized Plotly figures.
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from scripts.figure_encoding import figure_to_json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+def _loads(payload):
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+
+class FigureCache:
+    """Thread-safe LRU of figure JSON bounded by total serialized size.
+
+    Entries are keyed by (chart id, sorted mode tuple, start date, end date)
+    and stored pre-serialized, which keeps memory accounting exact and lets
+    the same payloads be persisted or shipped without re-rendering.
+
+    With a persist_dir, memory misses fall back to gzip-compressed figures
+    written there by the warm-up job (see scripts/warmup.py).
+
+    The entries belong to one owner (the dataset snapshot they were rendered
+    from), set by clear(); lookups on behalf of any other owner bypass them.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, persist_dir=None):
+        self.max_bytes = max_bytes
+        self.persist_dir = persist_dir
+        self.size_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        # Bumped by clear(), so figures rendered from a replaced dataset are dropped
+        self.generation = 0
+        self.owner = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(chart_id, modes, start_date=None, end_date=None, max_points=None):
+        """Canonical cache key; modes are sorted so selection order does not matter.
+
+        A point budget other than the chart's default is part of the key.
+        """
+        key = (chart_id, tuple(sorted(modes)), start_date, end_date)
+        return key if max_points is None else key + (max_points,)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_json(self, key, generation=None):
+        """Serialized figure for key, or None; a hit refreshes its LRU position.
+
+        With a generation, nothing is returned if the cache was cleared since.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return None
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+
+        payload = self.load_persisted(key)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self.put_json(key, payload, generation)
+        return payload
+
+    def get(self, key):
+        """Figure dict for key, or None."""
+        payload = self.get_json(key)
+        return None if payload is None else _loads(payload)
+
+    def put_json(self, key, payload, generation=None):
+        """Store a serialized figure, evicting least recently used entries to fit.
+
+        With a generation, the figure is discarded if the cache was cleared
+        since that generation was read.
+        """
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= len(previous)
+            self._entries[key] = payload
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def get_or_build_json(self, key, builder, owner=None):
+        """Return the serialized figure for key, building and storing it on a miss.
+
+        With an owner other than the cache's, the figure is built uncached.
+        """
+        with self._lock:
+            generation, current = self.generation, self.owner
+        if owner is not None and owner is not current:
+            return figure_to_json(builder())
+        payload = self.get_json(key, generation)
+        if payload is None:
+            payload = figure_to_json(builder())
+            self.put_json(key, payload, generation)
+        return payload
+
+    def get_or_build(self, key, builder, owner=None):
+        """Return the cached figure dict for key, building and storing it on a miss."""
+        return _loads(self.get_or_build_json(key, builder, owner))
+
+    def _persisted_path(self, key):
+        digest = hashlib.sha1(json.dumps(key).encode()).hexdigest()
+        return os.path.join(self.persist_dir, f"{digest}.json.gz")
+
+    def is_persisted(self, key):
+        """Whether a serialized figure for key exists in persist_dir."""
+        return self.persist_dir is not None and os.path.exists(self._persisted_path(key))
+
+    def load_persisted(self, key):
+        """Serialized figure for key from persist_dir, or None."""
+        if self.persist_dir is None:
+            return None
+        try:
+            with gzip.open(self._persisted_path(key), 'rb') as f:
+                return f.read().decode()
+        except OSError:
+            return None
+
+    def persist(self, key, payload):
+        """Write a serialized figure to persist_dir, atomically."""
+        os.makedirs(self.persist_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.persist_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+            f.write(payload.encode())
+        os.replace(tmp_path, self._persisted_path(key))
+
+    def items(self):
+        """Snapshot of (key, serialized figure) pairs, least recently used first."""
+        with self._lock:
+            return list(self._entries.items())
+
+    def clear(self, persist_dir=None, owner=None):
+        """Drop every entry, e.g. after the dataset is reloaded.
+
+        persist_dir replaces the on-disk tier, which is specific to a dataset
+        version; owner is whom the new entries belong to.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+            self.persist_dir = persist_dir
+            self.owner = owner
+            self.generation += 1
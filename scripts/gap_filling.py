@@ -0,0 +1,113 @@
+# Per-mode missing-value filling over (dates x modes) blocks.
+
+import numpy as np
+
+FILL_STRATEGIES = ('ffill', 'interpolate', 'mask')
+
+
+def _previous_valid_index(valid):
+    """Row index of the last valid value at or above each cell, -1 if none."""
+    rows = np.arange(valid.shape[0])[:, None]
+    return np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+
+
+def _next_valid_index(valid):
+    """Row index of the first valid value at or below each cell, n if none."""
+    n = valid.shape[0]
+    rows = np.arange(n)[:, None]
+    flipped = np.where(valid, rows, n)[::-1]
+    return np.minimum.accumulate(flipped, axis=0)[::-1]
+
+
+def _seed_arrays(seed, n_columns):
+    """(values, ages) of a seed, all-NaN when there is none."""
+    if seed is None:
+        return np.full(n_columns, np.nan), np.ones(n_columns, dtype=np.int64)
+    values, ages = seed
+    return np.asarray(values, dtype=float), np.asarray(ages, dtype=np.int64)
+
+
+def forward_fill(values, limit=None, seed=None):
+    """Carry each column's last valid value forward, at most `limit` rows.
+
+    seed is an optional (values, ages) pair: per column, the last valid value
+    before the block and how many rows before its first row it was, so a
+    block can continue an earlier one. Leading gaps without a seed stay NaN,
+    since each column is filled independently.
+    """
+    valid = ~np.isnan(values)
+    previous = _previous_valid_index(valid)
+    rows = np.arange(values.shape[0])[:, None]
+    columns = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+
+    source = values[np.maximum(previous, 0), columns]
+    distance = rows - previous
+    fillable = previous >= 0
+
+    seed_values, seed_ages = _seed_arrays(seed, values.shape[1])
+    leading = ~fillable & ~np.isnan(seed_values)
+    source = np.where(leading, seed_values, source)
+    distance = np.where(leading, rows + seed_ages, distance)
+    fillable |= leading
+
+    if limit is not None:
+        fillable &= distance <= limit
+
+    filled = np.where(fillable, source, np.nan)
+    return np.where(valid, values, filled)
+
+
+def interpolate_linear(values, limit=None, seed=None):
+    """Linearly interpolate interior gaps of each column along the date axis.
+
+    Gaps longer than `limit` rows, and leading or trailing gaps, stay NaN.
+    A seed (see forward_fill) makes a leading gap interior.
+    """
+    n = values.shape[0]
+    valid = ~np.isnan(values)
+    previous = _previous_valid_index(valid)
+    following = _next_valid_index(valid)
+    rows = np.arange(n)[:, None]
+    columns = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+
+    start = values[np.maximum(previous, 0), columns]
+    has_previous = previous >= 0
+    seed_values, seed_ages = _seed_arrays(seed, values.shape[1])
+    leading = ~has_previous & ~np.isnan(seed_values)
+    previous = np.where(leading, -seed_ages, previous)
+    start = np.where(leading, seed_values, start)
+    has_previous |= leading
+
+    interior = has_previous & (following < n)
+    if limit is not None:
+        interior &= (following - previous - 1) <= limit
+
+    end = values[np.minimum(following, n - 1), columns]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = (rows - previous) / (following - previous)
+        interpolated = start + (end - start) * weight
+
+    return np.where(valid, values, np.where(interior, interpolated, np.nan))
+
+
+def fill_gaps(values, strategy='ffill', limit=None, seed=None):
+    """Fill missing values per mode and return (filled, observed).
+
+    observed is the validity bitmap of the input: True where the value was
+    reported, False where it was imputed or is still missing. seed carries
+    the last valid values before the block (see forward_fill).
+    """
+    if strategy not in FILL_STRATEGIES:
+        raise ValueError(f"Unknown fill strategy '{strategy}', expected one of {FILL_STRATEGIES}")
+
+    values = np.asarray(values, dtype=float)
+    observed = ~np.isnan(values)
+
+    if strategy == 'ffill':
+        filled = forward_fill(values, limit=limit, seed=seed)
+    elif strategy == 'interpolate':
+        filled = interpolate_linear(values, limit=limit, seed=seed)
+    else:
+        filled = values.copy()
+
+    return filled, observed
@@ -0,0 +1,90 @@
+# Background reloading of the served dataset when its source CSV changes.
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetReloader:
+    """Daemon thread that refreshes an MTARidershipData when its CSV changes or on request.
+
+    The CSV's size and mtime are polled every `interval` seconds (0 disables
+    polling, leaving request_reload as the only trigger). New data is built
+    on this thread while request threads keep serving the current snapshot,
+    and published as a new one (see MTARidershipData.snapshot);
+    on_reload(data) then moves caches over to it, e.g.
+    visualization.initialize_cache_arrays.
+    """
+
+    def __init__(self, data, on_reload, interval=60):
+        self.data = data
+        self.on_reload = on_reload
+        self.interval = interval
+        self.last_reload = None
+        self.last_error = None
+        self._signature = self._source_signature()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _source_signature(self):
+        try:
+            stat = os.stat(self.data.filepath)
+            return stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return None
+
+    def start(self):
+        """Start the watcher thread (once)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='dataset-reloader', daemon=True)
+            self._thread.start()
+        return self
+
+    def request_reload(self):
+        """Ask the watcher thread to check the source now, without waiting for it."""
+        self._wake.set()
+
+    def reload(self):
+        """Ingest any new source data on the calling thread; True if a new snapshot was published.
+
+        A source that changed without adding rows (e.g. rows appended with
+        dates already covered) is reloaded in full. One whose last row is
+        still being written is left for the next check.
+        """
+        with self._lock:
+            signature = self._source_signature()
+            revision = self.data.revision
+            if not self.data.ingest_new_rows():
+                self.last_error = f"Reload failed at {time.strftime('%Y-%m-%d %H:%M:%S')}"
+                return False
+            if self.data.revision == revision and signature != self._signature:
+                if not self.data.covers_source():
+                    return False
+                logger.info("Source CSV changed without new rows; reloading it in full")
+                if not self.data.reload():
+                    self.last_error = f"Reload failed at {time.strftime('%Y-%m-%d %H:%M:%S')}"
+                    return False
+            self._signature = signature
+            self.last_error = None
+            if self.data.revision == revision:
+                return False
+
+            self.on_reload(self.data)
+            self.last_reload = time.time()
+            logger.info(f"Published dataset revision {self.data.revision} ({self.data.dataset_version})")
+            return True
+
+    def _run(self):
+        while True:
+            requested = self._wake.wait(self.interval or None)
+            self._wake.clear()
+            if requested or self._source_signature() != self._signature:
+                try:
+                    self.reload()
+                except Exception as e:
+                    self.last_error = str(e)
+                    logger.error(f"Error reloading dataset: {str(e)}")
@@ -0,0 +1,124 @@
+# Response compression and HTTP caching for the Dash server.
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from functools import lru_cache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; responses fall back to gzip
+    brotli = None
+
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+# Smaller bodies aren't worth compressing (headers and CPU outweigh the savings)
+COMPRESS_MIN_BYTES = int(os.environ.get('MTA_COMPRESS_MIN_BYTES', 1024))
+
+# Dynamic responses favour speed over ratio; both levels are close to the best ratio for JSON
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_TYPES = {
+    'application/json', 'application/javascript', 'text/javascript', 'text/css',
+    'text/html', 'text/plain', 'image/svg+xml', 'application/manifest+json'
+}
+
+# Fingerprinted assets never change under the same URL
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+
+@lru_cache(maxsize=256)
+def _file_digest(path, mtime_ns):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+def asset_url(app, path):
+    """URL of a file in the Dash assets folder, fingerprinted by its content."""
+    full_path = os.path.join(app.config.assets_folder, path)
+    digest = _file_digest(full_path, os.stat(full_path).st_mtime_ns)
+    return f"{app.get_asset_url(path)}?v={digest}"
+
+
+def figure_etag(key, dataset_version):
+    """Strong ETag of a figure: hash of its cache key (chart, modes, dates) and the dataset version."""
+    return hashlib.sha1(json.dumps([key, dataset_version]).encode()).hexdigest()
+
+
+def _accepted_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response):
+    """Compress a text response with brotli or gzip, as the client accepts.
+
+    Bodies under COMPRESS_MIN_BYTES, non-text types, partial and already
+    encoded responses are left alone. An ETag is weakened once the body is
+    re-encoded, so conditional requests still match it.
+    """
+    if (response.status_code != 200 or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = _accepted_encoding()
+    if encoding is None:
+        return response
+    if response.content_length is not None and response.content_length < COMPRESS_MIN_BYTES:
+        return response
+
+    # Static files are streamed from disk; read them so they can be encoded
+    response.direct_passthrough = False
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    if encoding == 'br':
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def cache_assets(response, assets_prefix):
+    """Cache fingerprinted assets for a year; others must revalidate (by ETag) each time.
+
+    Dash adds ?m=<mtime> to the CSS and JS it links from the index page, and
+    asset_url adds ?v=<content hash>.
+    """
+    if not request.path.startswith(assets_prefix):
+        return response
+    if request.args.get('m') or request.args.get('v'):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = ASSET_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+
+def init_http_caching(app):
+    """Install compression and asset caching on a Dash app's Flask server."""
+    assets_prefix = app.config.routes_pathname_prefix + app.config.assets_url_path.strip('/') + '/'
+
+    @app.server.after_request
+    def _cache_and_compress(response):
+        return compress_response(cache_assets(response, assets_prefix))
+
+    logger.info(f"Response compression enabled ({'brotli, gzip' if brotli is not None else 'gzip'}, "
+                f">= {COMPRESS_MIN_BYTES} bytes)")
@@ -0,0 +1,91 @@
+# Vectorized wide-to-long reshaping of the MTA ridership table.
+
+import numpy as np
+import pandas as pd
+
+# (ridership column, % of pre-pandemic column) pairs in the source CSV
+MODE_COLUMNS = [
+    ('Subways: Total Estimated Ridership', 'Subways: % of Comparable Pre-Pandemic Day'),
+    ('Buses: Total Estimated Ridership', 'Buses: % of Comparable Pre-Pandemic Day'),
+    ('LIRR: Total Estimated Ridership', 'LIRR: % of Comparable Pre-Pandemic Day'),
+    ('Metro-North: Total Estimated Ridership', 'Metro-North: % of Comparable Pre-Pandemic Day'),
+    ('Access-A-Ride: Total Scheduled Trips', 'Access-A-Ride: % of Comparable Pre-Pandemic Day'),
+    ('Bridges and Tunnels: Total Traffic', 'Bridges and Tunnels: % of Comparable Pre-Pandemic Day'),
+    ('Staten Island Railway: Total Estimated Ridership', 'Staten Island Railway: % of Comparable Pre-Pandemic Day')
+]
+
+MODES = [ridership_col.split(':')[0].strip() for ridership_col, _ in MODE_COLUMNS]
+
+
+def sort_by_date(raw_df):
+    """Rows of the wide CSV frame in ascending date order, one per date.
+
+    MTA exports list the newest date first. Of rows sharing a date, the last
+    one in the file wins, as a later correction would.
+    """
+    if raw_df['Date'].is_monotonic_increasing and raw_df['Date'].is_unique:
+        return raw_df
+    return (raw_df.sort_values('Date', kind='stable')
+            .drop_duplicates('Date', keep='last')
+            .reset_index(drop=True))
+
+
+def extract_wide_blocks(raw_df, mode_columns=MODE_COLUMNS):
+    """Split the wide CSV frame into its date axis and (dates x modes) value blocks.
+
+    Rows are sorted by date and deduplicated first (see sort_by_date), since
+    everything downstream searches and windows the date axis in order.
+    """
+    raw_df = sort_by_date(raw_df)
+    dates = pd.DatetimeIndex(raw_df['Date'])
+    ridership = raw_df[[ridership_col for ridership_col, _ in mode_columns]].to_numpy()
+    recovery = raw_df[[percentage_col for _, percentage_col in mode_columns]].to_numpy(dtype=float)
+    return dates, ridership, recovery
+
+
+def calendar_features(dates):
+    """Temporal features for each unique date, computed once per date."""
+    day_of_week = dates.dayofweek.to_numpy()
+    return {
+        'Year': dates.year.to_numpy(),
+        'Month': dates.month.to_numpy(),
+        'DayOfWeek': day_of_week,
+        'IsWeekend': day_of_week >= 5
+    }
+
+
+def wide_to_long(dates, modes, blocks):
+    """Build the long-format frame directly from (dates x modes) NumPy blocks.
+
+    Rows are laid out mode-major (all dates of the first mode, then the next),
+    so a transposed ravel of each block gives its column without a Python
+    loop. This matches the layout of the original per-mode concatenation. Dates and
+    modes are tiled/repeated, Mode is categorical, and calendar features are
+    computed on the unique dates and broadcast to every mode.
+
+    blocks maps column names to 2-D arrays of shape (len(dates), len(modes));
+    the calendar columns follow them.
+    """
+    n_dates, n_modes = len(dates), len(modes)
+    mode_codes = np.repeat(np.arange(n_modes, dtype=np.int8), n_dates)
+
+    columns = {
+        'Date': np.tile(dates.to_numpy(), n_modes),
+        'Mode': pd.Categorical.from_codes(mode_codes, categories=list(modes))
+    }
+    for name, block in blocks.items():
+        columns[name] = wide_to_long_column(block)
+    for name, values in calendar_features(dates).items():
+        columns[name] = np.tile(values, n_modes)
+
+    return pd.DataFrame(columns, copy=False)
+
+
+def long_to_wide(values, n_modes):
+    """View a mode-major long column as a (dates x modes) block."""
+    return np.asarray(values).reshape(n_modes, -1).T
+
+
+def wide_to_long_column(block):
+    """Flatten a (dates x modes) block into mode-major long order."""
+    return np.asarray(block).T.reshape(-1)
@@ -0,0 +1,81 @@
+# Per-mode weekly, monthly and yearly rollups of the daily ridership blocks.
+
+import numpy as np
+import pandas as pd
+
+# Rollup name -> pandas period frequency
+ROLLUP_FREQUENCIES = {
+    'weekly': 'W',
+    'monthly': 'M',
+    'yearly': 'Y'
+}
+
+# Measure -> (prefix sums, prefix counts) attributes of the summary cube
+_MEASURES = {
+    'Ridership': ('ridership_sums', 'ridership_counts'),
+    'Recovery_Percentage': ('recovery_sums', 'recovery_counts')
+}
+
+
+class PeriodRollups:
+    """Sums and counts of ridership and recovery per calendar period and mode.
+
+    Tables are materialized once from the summary cube's prefix sums (a
+    period's totals are the difference of the prefix rows at its bounds).
+    Keeping sums and counts rather than means lets periods and modes merge
+    exactly; a date range that cuts through a period only recomputes its
+    edge periods from the cube.
+    """
+
+    def __init__(self, cube, frequencies=ROLLUP_FREQUENCIES):
+        self.cube = cube
+        self.tables = {}
+        dates = pd.DatetimeIndex(cube.dates)
+        for name, freq in frequencies.items():
+            periods = dates.to_period(freq)
+            starts = np.flatnonzero(np.concatenate([[True], periods[1:] != periods[:-1]]))
+            bounds = np.concatenate([starts, [len(dates)]])
+            table = {'periods': periods[starts], 'bounds': bounds}
+            for measure, (sums, counts) in _MEASURES.items():
+                table[f"{measure}_sum"] = np.diff(getattr(cube, sums)[bounds], axis=0)
+                table[f"{measure}_count"] = np.diff(getattr(cube, counts)[bounds], axis=0)
+            self.tables[name] = table
+
+    def select(self, rollup, measure, modes, start_date=None, end_date=None):
+        """(periods, sums, counts) of a measure for the given modes and inclusive date range.
+
+        sums and counts have shape (len(periods), len(selected modes)), with
+        modes in cube order; edge periods only cover days inside the range.
+        """
+        table = self.tables[rollup]
+        columns = np.array([self.cube._mode_index[mode] for mode in self.cube.modes
+                            if mode in set(modes)], dtype=int)
+        lo, hi = self.cube._date_rows(start_date, end_date)
+        bounds = table['bounds']
+        first = int(np.searchsorted(bounds, lo, 'right')) - 1
+        last = int(np.searchsorted(bounds, hi, 'left'))
+        if hi <= lo:
+            first = last = 0
+
+        sums = table[f"{measure}_sum"][first:last][:, columns]
+        counts = table[f"{measure}_count"][first:last][:, columns]
+        if last > first and (bounds[first] < lo or bounds[last] > hi):
+            # Partial edge periods come straight from the cube's prefix sums
+            prefix_sums, prefix_counts = (getattr(self.cube, attr) for attr in _MEASURES[measure])
+            sums, counts = sums.copy(), counts.copy()
+            for row in {0, last - first - 1}:
+                start, stop = np.clip(bounds[first + row:first + row + 2], lo, hi)
+                sums[row] = prefix_sums[stop, columns] - prefix_sums[start, columns]
+                counts[row] = prefix_counts[stop, columns] - prefix_counts[start, columns]
+        return table['periods'][first:last], sums, counts
+
+    def means(self, rollup, measure, modes, start_date=None, end_date=None):
+        """Period means of a measure as a frame indexed by period, one column per mode.
+
+        Periods without any value for a mode are NaN.
+        """
+        periods, sums, counts = self.select(rollup, measure, modes, start_date, end_date)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        selected = [mode for mode in self.cube.modes if mode in set(modes)]
+        return pd.DataFrame(values, index=periods, columns=pd.Index(selected, name='Mode'))
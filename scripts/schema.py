@@ -0,0 +1,52 @@
+# Column dtypes of the processed long-format frame.
+
+import pandas as pd
+
+# Ridership-scale measures are float32: whole counts below 2**24 are exact
+# and derived means keep ~7 significant digits. Recovery fractions stay
+# float64, since values like 0.97 aren't exact in float32 and would show up
+# as 0.97000003 in hover labels and figure JSON. Sums for KPIs are taken in
+# float64 by the summary cube.
+PROCESSED_SCHEMA = {
+    'Date': 'datetime64[ns]',
+    'Mode': 'category',
+    'Ridership': 'float32',
+    'Recovery_Percentage': 'float64',
+    'Year': 'int16',
+    'Month': 'int8',
+    'DayOfWeek': 'int8',
+    'IsWeekend': 'bool',
+    'Pre_Pandemic_Baseline': 'float32',
+    'Ridership_7day_MA': 'float32',
+    'Ridership_7day_Smoothed': 'float32',
+    'Ridership_7day_CMA': 'float32',
+    'Ridership_14day_CMA': 'float32',
+    'Recovery_30day_MA': 'float64',
+    'Ridership_Observed': 'bool',
+    'Recovery_Observed': 'bool'
+}
+
+
+def apply_schema(frame, schema=PROCESSED_SCHEMA):
+    """Cast columns to their schema dtypes in place; other columns are left as they are."""
+    for name, dtype in schema.items():
+        if name not in frame:
+            continue
+        if dtype == 'category':
+            if not isinstance(frame[name].dtype, pd.CategoricalDtype):
+                frame[name] = frame[name].astype('category')
+        elif frame[name].dtype != dtype:
+            frame[name] = frame[name].to_numpy().astype(dtype)
+    return frame
+
+
+def memory_report(frame):
+    """Bytes used by each column, with its dtype, largest first, plus a total row."""
+    usage = frame.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'dtype': frame.dtypes.astype(str),
+        'bytes': usage,
+        'bytes_per_row': usage / max(len(frame), 1)
+    }).sort_values('bytes', ascending=False)
+    report.loc['Total'] = ['', usage.sum(), usage.sum() / max(len(frame), 1)]
+    return report
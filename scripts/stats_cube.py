@@ -0,0 +1,200 @@
+# Precomputed per-mode summary statistics for fast KPI queries.
+
+import numpy as np
+import pandas as pd
+
+from scripts.reshape import long_to_wide
+
+
+def _prefix_sums(values):
+    """Cumulative sums along dates with a leading zero row, so range sums are two lookups."""
+    return np.concatenate([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+
+
+# Arrays making up a cube, as saved with the processed bundle
+CUBE_ARRAYS = (
+    'dates', 'ridership', 'recovery', 'recovery_valid',
+    'ridership_sums', 'ridership_counts', 'recovery_sums', 'recovery_counts',
+    'peak_rows', 'peak_values'
+)
+
+
+class SummaryCube:
+    """Per-mode sums, counts and maxima over (dates x modes) blocks.
+
+    Sums and counts are stored as prefix sums along the date axis, so the
+    KPIs of any mode subset and date range combine algebraically in
+    O(#modes); per-date recovery means only touch the selected columns.
+
+    The arrays are saved with the processed bundle (see to_arrays), so
+    processes memory-mapping it share one copy instead of each building its
+    own. Sums stay float64: range sums are differences of running totals in
+    the billions, which float32 would only resolve to hundreds of riders.
+    """
+
+    def __init__(self, dates, modes, ridership, recovery):
+        self.dates = np.asarray(dates, dtype='datetime64[ns]')
+        self.modes = list(modes)
+        self._mode_index = {mode: i for i, mode in enumerate(self.modes)}
+
+        ridership = np.asarray(ridership, dtype=float)
+        recovery = np.asarray(recovery, dtype=float)
+        ridership_valid = ~np.isnan(ridership)
+        recovery_valid = ~np.isnan(recovery)
+
+        self.ridership = ridership
+        self.recovery = np.where(recovery_valid, recovery, 0.0)
+        self.recovery_valid = recovery_valid
+
+        self.ridership_sums = _prefix_sums(np.where(ridership_valid, ridership, 0.0))
+        self.ridership_counts = _prefix_sums(ridership_valid)
+        self.recovery_sums = _prefix_sums(self.recovery)
+        self.recovery_counts = _prefix_sums(recovery_valid)
+
+        # Full-history maxima, the common case for the peak-day KPI
+        filled = np.where(ridership_valid, ridership, -np.inf)
+        self.peak_rows = filled.argmax(axis=0)
+        self.peak_values = filled.max(axis=0)
+
+    def updated(self, first_changed, dates, ridership, recovery):
+        """Cube for blocks that match this one before row first_changed.
+
+        Prefix sums of the unchanged rows are reused and only the tail is
+        re-accumulated; maxima are rescanned only if a peak lies in the tail.
+        """
+        cube = object.__new__(SummaryCube)
+        cube.dates = np.asarray(dates, dtype='datetime64[ns]')
+        cube.modes = self.modes
+        cube._mode_index = self._mode_index
+
+        ridership = np.asarray(ridership, dtype=float)
+        recovery = np.asarray(recovery, dtype=float)
+        ridership_valid = ~np.isnan(ridership)
+        recovery_valid = ~np.isnan(recovery)
+
+        cube.ridership = ridership
+        cube.recovery = np.where(recovery_valid, recovery, 0.0)
+        cube.recovery_valid = recovery_valid
+
+        def extend(prefix, values):
+            tail = prefix[first_changed] + np.cumsum(values[first_changed:], axis=0)
+            return np.concatenate([prefix[:first_changed + 1], tail])
+
+        cube.ridership_sums = extend(self.ridership_sums, np.where(ridership_valid, ridership, 0.0))
+        cube.ridership_counts = extend(self.ridership_counts, ridership_valid)
+        cube.recovery_sums = extend(self.recovery_sums, cube.recovery)
+        cube.recovery_counts = extend(self.recovery_counts, recovery_valid)
+
+        filled = np.where(ridership_valid[first_changed:], ridership[first_changed:], -np.inf)
+        tail_rows = first_changed + filled.argmax(axis=0)
+        tail_values = filled.max(axis=0)
+        if np.any(self.peak_rows >= first_changed):
+            filled = np.where(ridership_valid, ridership, -np.inf)
+            cube.peak_rows = filled.argmax(axis=0)
+            cube.peak_values = filled.max(axis=0)
+        else:
+            # Earlier peaks win ties, as with argmax over the full history
+            keep = self.peak_values >= tail_values
+            cube.peak_rows = np.where(keep, self.peak_rows, tail_rows)
+            cube.peak_values = np.where(keep, self.peak_values, tail_values)
+        return cube
+
+    def to_arrays(self):
+        """The cube's arrays by name, for storing with the processed bundle."""
+        return {name: getattr(self, name) for name in CUBE_ARRAYS}
+
+    @classmethod
+    def from_arrays(cls, modes, arrays):
+        """Cube over arrays saved by to_arrays (possibly memory-mapped), without copying them."""
+        missing = [name for name in CUBE_ARRAYS if name not in arrays]
+        if missing:
+            raise ValueError(f"Summary cube arrays are missing: {', '.join(missing)}")
+        cube = object.__new__(cls)
+        cube.modes = list(modes)
+        cube._mode_index = {mode: i for i, mode in enumerate(cube.modes)}
+        for name in CUBE_ARRAYS:
+            setattr(cube, name, arrays[name])
+        return cube
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Build the cube from a mode-major processed frame (see wide_to_long)."""
+        modes = list(frame['Mode'].cat.categories)
+        n_dates = len(frame) // len(modes)
+        return cls(
+            frame['Date'].to_numpy()[:n_dates],
+            modes,
+            long_to_wide(frame['Ridership'].to_numpy(), len(modes)),
+            long_to_wide(frame['Recovery_Percentage'].to_numpy(), len(modes))
+        )
+
+    def _date_rows(self, start_date=None, end_date=None):
+        """Row range [lo, hi) covering an inclusive date range."""
+        lo = 0 if start_date is None else int(np.searchsorted(
+            self.dates, pd.Timestamp(start_date).to_datetime64(), 'left'))
+        hi = len(self.dates) if end_date is None else int(np.searchsorted(
+            self.dates, pd.Timestamp(end_date).to_datetime64(), 'right'))
+        return lo, max(lo, hi)
+
+    @staticmethod
+    def _range(prefix, lo, hi, columns):
+        return prefix[hi, columns] - prefix[lo, columns]
+
+    def summarize(self, modes, start_date=None, end_date=None):
+        """KPIs for a mode subset and inclusive date range, or None if it selects no data.
+
+        Returns a dict with total and mean ridership, the 30-day trend windows,
+        per-date recovery mean and peak, per-mode totals and the peak day.
+        """
+        selected = [mode for mode in self.modes if mode in set(modes)]
+        columns = np.array([self._mode_index[mode] for mode in selected], dtype=int)
+        lo, hi = self._date_rows(start_date, end_date)
+
+        counts = self._range(self.ridership_counts, lo, hi, columns)
+        if len(columns) == 0 or counts.sum() == 0:
+            return None
+        sums = self._range(self.ridership_sums, lo, hi, columns)
+
+        # Trend: last 30 days against the 30 days before, relative to the last date
+        last_date = self.dates[hi - 1]
+        current_lo = max(lo, int(np.searchsorted(self.dates, last_date - np.timedelta64(30, 'D'), 'left')))
+        previous_lo = max(lo, int(np.searchsorted(self.dates, last_date - np.timedelta64(60, 'D'), 'left')))
+
+        def window_mean(start, stop):
+            count = self._range(self.ridership_counts, start, stop, columns).sum()
+            total = self._range(self.ridership_sums, start, stop, columns).sum()
+            return total / count if count else np.nan
+
+        # Recovery averaged across the selected modes on each date
+        recovery_sums = self.recovery[lo:hi, columns].sum(axis=1)
+        recovery_counts = self.recovery_valid[lo:hi, columns].sum(axis=1)
+        daily_recovery = recovery_sums[recovery_counts > 0] / recovery_counts[recovery_counts > 0]
+
+        mode_recovery_counts = self._range(self.recovery_counts, lo, hi, columns)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mode_recovery = self._range(self.recovery_sums, lo, hi, columns) / mode_recovery_counts
+        mode_totals = pd.DataFrame(
+            {'Ridership': sums, 'Recovery_Percentage': mode_recovery},
+            index=pd.Index(selected, name='Mode')
+        )
+
+        # Peak day: highest ridership of any selected mode; first mode wins ties
+        if lo == 0 and hi == len(self.dates):
+            peak_rows, peak_values = self.peak_rows[columns], self.peak_values[columns]
+        else:
+            window = np.where(np.isnan(self.ridership[lo:hi, columns]), -np.inf,
+                              self.ridership[lo:hi, columns])
+            peak_rows, peak_values = lo + window.argmax(axis=0), window.max(axis=0)
+        peak_mode = int(np.argmax(peak_values))
+
+        return {
+            'total_ridership': sums.sum(),
+            'daily_avg': sums.sum() / counts.sum(),
+            'current_period': window_mean(current_lo, hi),
+            'previous_period': window_mean(previous_lo, current_lo),
+            'avg_recovery': daily_recovery.mean() if len(daily_recovery) else np.nan,
+            'peak_recovery': daily_recovery.max() if len(daily_recovery) else np.nan,
+            'mode_totals': mode_totals,
+            'peak_day': pd.Timestamp(self.dates[peak_rows[peak_mode]]),
+            'peak_value': peak_values[peak_mode]
+        }
@@ -0,0 +1,61 @@
+# Timeline events (policy and health milestones, service changes) shown on the charts.
+
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_EVENTS_PATH = os.path.join('data', 'timeline_events.csv')
+
+EVENT_COLUMNS = ['date', 'event', 'category', 'impact_level', 'description', 'ridership_impact', 'phase']
+
+
+class TimelineEvents:
+    """Events sorted by date, with an index for date-range lookups.
+
+    Loaded once per dataset. between() finds the events of a range with two
+    binary searches, so charts only handle the events they show however many
+    the file holds.
+    """
+
+    def __init__(self, frame):
+        missing = [column for column in EVENT_COLUMNS if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Timeline events are missing columns: {', '.join(missing)}")
+        frame = frame.assign(date=pd.to_datetime(frame['date']))
+        if frame['date'].isna().any():
+            raise ValueError("Timeline events have missing dates")
+        # Stable sort, so events on the same date keep the file's order
+        self.frame = frame.sort_values('date', kind='stable').reset_index(drop=True)
+        self.dates = self.frame['date'].to_numpy()
+        self.records = self.frame.to_dict('records')
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_EVENTS_PATH):
+        """Load events from a CSV file, or a JSON list of records (.json)."""
+        if os.path.splitext(path)[1].lower() == '.json':
+            frame = pd.read_json(path, orient='records', convert_dates=False, dtype=False)
+        else:
+            frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+        return cls(frame)
+
+    @classmethod
+    def empty(cls):
+        return cls(pd.DataFrame(columns=EVENT_COLUMNS))
+
+    def __len__(self):
+        return len(self.dates)
+
+    def span(self, start_date=None, end_date=None):
+        """(start, stop) positions of the events in an inclusive date range; None leaves a side open."""
+        start, stop = 0, len(self.dates)
+        if start_date is not None:
+            start = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start_date)), 'left'))
+        if end_date is not None:
+            stop = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end_date)), 'right'))
+        return start, max(start, stop)
+
+    def between(self, start_date=None, end_date=None):
+        """Events in an inclusive date range, as a frame sorted by date."""
+        start, stop = self.span(start_date, end_date)
+        return self.frame.iloc[start:stop]
@@ -1,23 +1,163 @@
 # Contains functions to generate Plotly figures used in the app.
 
-import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 from datetime import timedelta
+import numpy as np
 import pandas as pd
 from functools import lru_cache
-import numpy as np
 
-# Global variables for caching
-RIDERSHIP_ARRAY = None
-MODE_INDICES = None
+import os
+
+from scripts.dataset_snapshot import DatasetSnapshot
+from scripts.distributions import weekday_weekend_summaries
+from scripts.downsampling import DEFAULT_MAX_POINTS, minmax_indices
+from scripts.figure_cache import FigureCache
+
+# Bump whenever a figure builder changes its output, so persisted figures are re-rendered
+RENDER_VERSION = 7
+
+# Points per overview trace when the plot's width isn't known (first render)
+OVERVIEW_MAX_POINTS = int(os.environ.get('OVERVIEW_MAX_POINTS', DEFAULT_MAX_POINTS))
+
+# Zooming in re-renders the visible range with a min and a max per pixel column
+# of the plot; widths are rounded up to steps so nearby sizes share figures
+OVERVIEW_WIDTH_STEP = 100
+OVERVIEW_MAX_WIDTH = 4000
+
+# Rendered figures of the published snapshot, keyed by (chart id, modes, date range)
+FIGURE_CACHE = FigureCache(
+    max_bytes=int(os.environ.get('FIGURE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+)
+
+# Static styling, built once and shared by every render of the builders below
+
+MODE_COLORS = {
+    'Subways': '#345995',
+    'Buses': '#03cea4',
+    'LIRR': '#e40066',
+    'Metro-North': '#eac435',
+    'Access-A-Ride': '#fb4d3d',
+    'Bridges and Tunnels': '#234985',
+    'Staten Island Railway': '#02a87d'
+}
+
+# Función auxiliar para convertir colores hex a rgba
+def rgb_to_rgba(hex_color):
+    """Convert hex color to rgba values"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16)/255 for i in (0, 2, 4))
+
+# Lighter and darker versions of each color, for the weekday/weekend halves
+WEEKDAY_WEEKEND_COLORS = {
+    mode: {
+        'weekday': f'rgba{tuple(max(0, int(c * 255 - 25)) for c in rgb_to_rgba(color)[:3] + (0.6,))}',  # Más claro
+        'weekend': f'rgba{tuple(int(c * 255 + 25) for c in rgb_to_rgba(color)[:3] + (1,))}'      # Más oscuro
+    }
+    for mode, color in MODE_COLORS.items()
+}
+
+# Custom colorscale using app's color palette
+HEATMAP_COLORSCALE = [
+    [0, '#fb4d3d'],      # Rojo para valores bajos (del Access-A-Ride)
+    [0.3, '#eac435'],    # Amarillo (del Metro-North)
+    [0.6, '#03cea4'],    # Verde azulado (del Buses)
+    [0.8, '#345995'],    # Azul (del Subways)
+    [1, '#234985']       # Azul oscuro (del Bridges and Tunnels)
+]
+
+# Enhanced color scheme for timeline events
+EVENT_COLORS = {
+    'health': {
+        'critical': '#DC3545',
+        'major': '#DE6B48',
+        'moderate': '#E19578'
+    },
+    'policy': {
+        'critical': '#28A745',
+        'major': '#43AA8B',
+        'moderate': '#90BE6D'
+    }
+}
+
+DEFAULT_EVENT_COLOR = '#6C757D'
+
+# Height (in paper coordinates) of each phase's event annotations
+_aditional_offset = 0.02
+EVENT_PHASE_POSITIONS = {
+    'initial': 0.45,
+    'lockdown': 0.50 + _aditional_offset*1,
+    'early_recovery': 0.55+ _aditional_offset*2,
+    'adaptation': 0.60+ _aditional_offset*3,
+    'recovery': 0.65+ _aditional_offset*4,
+    'late_recovery': 0.70+ _aditional_offset*5,
+    'new_normal': 0.75+ _aditional_offset*6
+}
+DEFAULT_EVENT_PHASE_POSITION = EVENT_PHASE_POSITIONS['initial']
+
+# plotly_white, limited to the cartesian axes and trace types drawn here: the
+# template is validated with every figure, so unused parts only cost time
+CHART_TEMPLATE = go.layout.Template(
+    layout=pio.templates['plotly_white'].layout,
+    data={trace: pio.templates['plotly_white'].data[trace] for trace in ('bar', 'heatmap', 'scatter')}
+)
+CHART_TEMPLATE.layout.update(geo=None, mapbox=None, polar=None, scene=None, ternary=None)
+
+# Consistent styling of all charts (see apply_chart_template)
+CHART_STYLE = go.Layout(
+    title=dict(
+        font=dict(size=24, color='#2c3e50'),
+        x=0.5,
+        y=0.95
+    ),
+    margin=dict(l=60, r=150, t=100, b=60),
+    legend=dict(
+        yanchor="top",
+        y=0.99,
+        xanchor="left",
+        x=1.05,
+        bgcolor='rgba(255,255,255,0.8)',
+        bordercolor='rgba(0,0,0,0.1)',
+        borderwidth=1
+    ),
+    plot_bgcolor='white',
+    paper_bgcolor='white',
+    font=dict(family='Roboto'),
+    template=CHART_TEMPLATE
+)
+
+def chart_layout(title=None, height=500, **layout):
+    """Prebuilt layout of a chart: its own settings, then the shared styling on top
+
+    Same result as setting them on a figure and calling apply_chart_template,
+    but built once: figures are created with it as their layout.
+    """
+    return go.Layout(layout).update(CHART_STYLE).update(height=height, title_text=title if title else "")
+
+def figure_persist_dir(data, snapshot=None):
+    """Directory of pre-rendered figures for the dataset version of a snapshot of data
+    (its current one by default), if any"""
+    snapshot = snapshot or data.snapshot
+    if snapshot.dataset_version is None or data.cache_dir is None:
+        return None
+    return os.path.join(data.cache_dir, 'figures', f"{snapshot.dataset_version}-r{RENDER_VERSION}")
+
+def _snapshot_of(data):
+    """The DatasetSnapshot to render from: data itself, or an MTARidershipData's current one"""
+    return data if isinstance(data, DatasetSnapshot) else data.snapshot
 
 def initialize_cache_arrays(data):
-    """Initialize global cache arrays for faster filtering"""
-    global RIDERSHIP_ARRAY, MODE_INDICES
-    RIDERSHIP_ARRAY = data.processed_data.to_records(index=False)
-    unique_modes = data.processed_data['Mode'].unique()
-    MODE_INDICES = {mode: idx for idx, mode in enumerate(unique_modes)}
+    """Hand the figure cache over to the current snapshot of data (an MTARidershipData)
+
+    Called once data is loaded and after each reload. The snapshot carries
+    its own index (its store); until this runs, requests on a newer
+    snapshot render without the cache, and those still on the previous one
+    keep using it.
+    """
+    snapshot = data.snapshot
+    _cached_filter.cache_clear()
+    FIGURE_CACHE.clear(persist_dir=figure_persist_dir(data, snapshot), owner=snapshot)
 
 def _prepare_modes_for_cache(modes):
     """Helper function to prepare modes for caching"""
@@ -28,90 +168,186 @@ def _prepare_modes_for_cache(modes):
     return tuple(sorted(modes))  # Sort to ensure consistent caching
 
 @lru_cache(maxsize=128)
-def _cached_filter(modes_tuple, start_date=None, end_date=None):
-    """Internal cached function that works with tuples"""
-    mode_mask = np.isin(RIDERSHIP_ARRAY['Mode'], modes_tuple)
-    filtered_array = RIDERSHIP_ARRAY[mode_mask]
-    
-    if start_date and end_date:
-        date_mask = (filtered_array['Date'] >= start_date) & (filtered_array['Date'] <= end_date)
-        filtered_array = filtered_array[date_mask]
-    
-    return pd.DataFrame.from_records(filtered_array)
+def _cached_filter(store, modes_tuple, start_date=None, end_date=None):
+    """Internal cached function that works with tuples
+
+    The store is part of the key, so a lookup that races a dataset swap can't
+    cache old rows under the new snapshot.
+    """
+    return store.select(modes_tuple, start_date, end_date)
+
+def _prepare_date_for_cache(date):
+    """Normalise a date-like value to a 'YYYY-MM-DD' string (or None) for caching"""
+    if date is None or date == '':
+        return None
+    return pd.Timestamp(date).strftime('%Y-%m-%d')
+
+def _prepare_date_range_for_cache(store, start_date, end_date):
+    """Normalise a date range; bounds at or beyond the store's extent become None
+
+    This way the date picker's default (the full history) shares cache
+    entries with unfiltered requests.
+    """
+    start_date = _prepare_date_for_cache(start_date)
+    end_date = _prepare_date_for_cache(end_date)
+    first, last = (d.strftime('%Y-%m-%d') for d in store.date_bounds())
+    if start_date is not None and start_date <= first:
+        start_date = None
+    if end_date is not None and end_date >= last:
+        end_date = None
+    return start_date, end_date
 
-def filter_data(data, modes):
-    """Public interface for filtering data"""
+def filter_data(data, modes, start_date=None, end_date=None):
+    """Public interface for filtering data by modes and an inclusive date range"""
+    store = _snapshot_of(data).store
     modes_tuple = _prepare_modes_for_cache(modes)
-    return _cached_filter(modes_tuple)
+    return _cached_filter(store, modes_tuple, *_prepare_date_range_for_cache(store, start_date, end_date))
 
 def apply_chart_template(fig, title=None, height=500):
     """Apply consistent styling to all charts"""
-    fig.update_layout(
-        height=height,
-        title=dict(
-            text=title if title else "",
-            font=dict(size=24, color='#2c3e50'),
-            x=0.5,
-            y=0.95
-        ),
-        template='plotly_white',
-        margin=dict(l=60, r=150, t=100, b=60),
-        legend=dict(
-            yanchor="top",
-            y=0.99,
-            xanchor="left",
-            x=1.05,
-            bgcolor='rgba(255,255,255,0.8)',
-            bordercolor='rgba(0,0,0,0.1)',
-            borderwidth=1
-        ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(family='Roboto')
-    )
+    fig.update_layout(CHART_STYLE, height=height, title_text=title if title else "")
     return fig
 
-def generate_overview_chart(df, timeline_events=None):
-    """Enhanced overview chart with improved timeline annotations and context"""
-    # Calculate moving averages for each mode
-    df_smooth_7 = df.copy()
-    df_smooth_14 = df.copy()
-    
-    # Calculate both 7-day and 14-day moving averages
-    df_smooth_7['Ridership'] = df.groupby('Mode')['Ridership'].transform(
-        lambda x: x.rolling(window=7, center=True).mean()
-    )
-    df_smooth_14['Ridership'] = df.groupby('Mode')['Ridership'].transform(
-        lambda x: x.rolling(window=14, center=True).mean()
+OVERVIEW_LAYOUT = chart_layout(
+    title="Overview",
+    height=550,
+    showlegend=True,
+    legend=dict(
+        yanchor="top",
+        y=0.99,
+        xanchor="left",
+        x=1.05,  # Position legend to the right of the chart
+        bgcolor='rgba(255,255,255,0.9)',
+        bordercolor='rgba(0,0,0,0.1)',
+        borderwidth=1,
+        font=dict(size=11, family='Arial')
+    ),
+    margin=dict(
+        l=60,
+        r=150,  # Right margin for legend
+        t=150,  # Increased top margin for staggered annotations
+        b=60
     )
+)
 
-    custom_colors = {
-        'Subways': '#345995',
-        'Buses': '#03cea4',
-        'LIRR': '#e40066',
-        'Metro-North': '#eac435',
-        'Access-A-Ride': '#fb4d3d',
-        'Bridges and Tunnels': '#234985',
-        'Staten Island Railway': '#02a87d'
-    }
+def timeline_overlay(events):
+    """Enhanced timeline annotations with impact levels and phases
+
+    Returns the (shapes, annotations) marking each event record on the
+    overview: a dotted vertical line and a label staggered by phase.
+    Categories, impact levels and phases without a style of their own get
+    the default ones.
+    """
+    shapes = []
+    annotations = []
     
-    # Create figure
-    fig = go.Figure()
+    for event in events:
+        color = EVENT_COLORS.get(event['category'], {}).get(event['impact_level'], DEFAULT_EVENT_COLOR)
+        y_position = EVENT_PHASE_POSITIONS.get(event['phase'], DEFAULT_EVENT_PHASE_POSITION)
+        
+        # Add vertical reference line
+        shapes.append(dict(
+            type="line",
+            x0=event['date'],
+            x1=event['date'],
+            y0=0,
+            y1=y_position - 0.02,
+            yref="paper",
+            line=dict(
+                color=color,
+                width=1,
+                dash="dot"
+            ),
+            opacity=0.6
+        ))
+        
+        # Add enhanced annotation with hover text
+        annotations.append(dict(
+            x=event['date'],
+            y=y_position,
+            xref='x',
+            yref='paper',
+            text=f"<b>{event['event']}</b>",
+            showarrow=True,
+            arrowhead=2,
+            arrowsize=1,
+            arrowwidth=1.5,
+            arrowcolor=color,
+            ax=0,
+            ay=-20,
+            bordercolor=color,
+            borderwidth=1,
+            borderpad=4,
+            bgcolor='rgba(255, 255, 255, 0.95)',
+            opacity=1,
+            font=dict(
+                size=11,
+                color='#2c3e50',
+                family='Arial'
+            ),
+            hovertext=(
+                f"<b><span style='font-size:14px;color:#2c3e50'>{event['description']}</span></b><br><br>"
+                f"<span style='color:#1f77b4'><b>Impact:</b></span> {event['ridership_impact']}<br>"
+                f"<span style='color:#2ca02c'><b>Phase:</b></span> {event['phase']}<br>" 
+                f"<span style='color:#d62728'><b>Impact Level:</b></span> {event['impact_level']}"
+            )
+        ))
+    
+    return shapes, annotations
+
+@lru_cache(maxsize=4)
+def _event_overlay(timeline_events):
+    """Shapes and annotations of every event of a TimelineEvents store, built once per store"""
+    return timeline_overlay(timeline_events.records)
+
+@lru_cache(maxsize=64)
+def _overview_layout(timeline_events, start, stop):
+    shapes, annotations = _event_overlay(timeline_events)
+    return go.Layout(OVERVIEW_LAYOUT).update(shapes=shapes[start:stop], annotations=annotations[start:stop])
+
+def overview_layout(timeline_events=None, start_date=None, end_date=None):
+    """Overview layout, with the events of timeline_events (a TimelineEvents) in a date range
+
+    Events are looked up in the store's date index; layouts are cached by
+    the span of events they show, so most renders reuse one.
+    """
+    if timeline_events is None:
+        return OVERVIEW_LAYOUT
+    return _overview_layout(timeline_events, *timeline_events.span(start_date, end_date))
+
+def generate_overview_chart(df, timeline_events=None, max_points=None):
+    """Enhanced overview chart with improved timeline annotations and context
+
+    Each trace is min/max-downsampled to at most max_points points
+    (OVERVIEW_MAX_POINTS by default) over the rows it is given. Only the
+    events of timeline_events (a TimelineEvents) within those rows' dates
+    are annotated.
+    """
+    max_points = max_points or OVERVIEW_MAX_POINTS
+    # 7- and 14-day centered averages are precomputed in process_data
+    traces = []
     
-    # Add traces for each mode - daily, 7-day, and 14-day averages
+    # Add traces for each mode - daily, 7-day, and 14-day averages. Traces
+    # are tagged with their mode (meta) so the browser can toggle modes on
+    # an all-modes figure (assets/mode_toggle.js)
     for mode in df['Mode'].unique():
         mode_data = df[df['Mode'] == mode]
-        mode_smooth_7 = df_smooth_7[df_smooth_7['Mode'] == mode]
-        mode_smooth_14 = df_smooth_14[df_smooth_14['Mode'] == mode]
+        
+        def reduced(column):
+            # (x, y) of a column, downsampled to the point budget
+            keep = minmax_indices(mode_data[column].to_numpy(), max_points)
+            return mode_data['Date'].iloc[keep], mode_data[column].iloc[keep]
         
         # Daily data (initially hidden)
-        fig.add_trace(
+        x, y = reduced('Ridership')
+        traces.append(
             go.Scatter(
-                x=mode_data['Date'],
-                y=mode_data['Ridership'],
+                x=x,
+                y=y,
                 name=f"{mode} (Daily)",
+                meta=mode,
                 line=dict(
-                    color=custom_colors[mode],
+                    color=MODE_COLORS[mode],
                     width=1,
                     dash='solid'
                 ),
@@ -120,311 +356,228 @@ def generate_overview_chart(df, timeline_events=None):
         )
         
         # 7-day average (shown by default)
-        fig.add_trace(
+        x, y = reduced('Ridership_7day_CMA')
+        traces.append(
             go.Scatter(
-                x=mode_smooth_7['Date'],
-                y=mode_smooth_7['Ridership'],
+                x=x,
+                y=y,
                 name=f"{mode} (7-Day Avg)",
-                line=dict(color=custom_colors[mode], width=2.5),
+                meta=mode,
+                line=dict(color=MODE_COLORS[mode], width=2.5),
                 visible=True
             )
         )
         
         # 14-day average (initially hidden)
-        fig.add_trace(
+        x, y = reduced('Ridership_14day_CMA')
+        traces.append(
             go.Scatter(
-                x=mode_smooth_14['Date'],
-                y=mode_smooth_14['Ridership'],
+                x=x,
+                y=y,
                 name=f"{mode} (14-Day Avg)",
-                line=dict(color=custom_colors[mode], width=3),
+                meta=mode,
+                line=dict(color=MODE_COLORS[mode], width=3),
                 visible=False
             )
         )
 
-    # Update layout without buttons, keeping right-side legend
-    fig.update_layout(
-        showlegend=True,
-        legend=dict(
-            yanchor="top",
-            y=0.99,
-            xanchor="left",
-            x=1.05,  # Position legend to the right of the chart
-            bgcolor='rgba(255,255,255,0.9)',
-            bordercolor='rgba(0,0,0,0.1)',
-            borderwidth=1,
-            font=dict(size=11, family='Arial')
-        ),
-        margin=dict(
-            l=60,
-            r=150,  # Right margin for legend
-            t=150,  # Increased top margin for staggered annotations
-            b=60
-        )
-    )
+    # Right-side legend and the annotations of the events in the plotted
+    # range come with the prebuilt layout
+    dates = df['Date']
+    layout = overview_layout(timeline_events, dates.min(), dates.max()) if len(df) else OVERVIEW_LAYOUT
+    return go.Figure(data=traces, layout=layout)
 
-    # Enhanced timeline annotations with impact levels and phases
-    if timeline_events is not None:
-        annotations = []
-        
-        # Sort events chronologically
-        timeline_events = timeline_events.sort_values('date', ascending=True)
-        
-        # Enhanced color scheme for events
-        colors = {
-            'health': {
-                'critical': '#DC3545',
-                'major': '#DE6B48',
-                'moderate': '#E19578'
-            },
-            'policy': {
-                'critical': '#28A745',
-                'major': '#43AA8B',
-                'moderate': '#90BE6D'
-            }
-        }
-
-        aditional_offset = 0.02
-        # Phase markers
-        phase_positions = {
-            'initial': 0.45,
-            'lockdown': 0.50 + aditional_offset*1,
-            'early_recovery': 0.55+ aditional_offset*2,
-            'adaptation': 0.60+ aditional_offset*3,
-            'recovery': 0.65+ aditional_offset*4,
-            'late_recovery': 0.70+ aditional_offset*5,
-            'new_normal': 0.75+ aditional_offset*6
-        }
-
-        for i, (_, event) in enumerate(timeline_events.iterrows()):
-            color = colors[event['category']][event['impact_level']]
-            y_position = phase_positions[event['phase']]
-            
-            # Add vertical reference line
-            fig.add_shape(
-                type="line",
-                x0=event['date'],
-                x1=event['date'],
-                y0=0,
-                y1=y_position - 0.02,
-                yref="paper",
-                line=dict(
-                    color=color,
-                    width=1,
-                    dash="dot"
-                ),
-                opacity=0.6
-            )
-            
-            # Add enhanced annotation with hover text
-            annotations.append(dict(
-                x=event['date'],
-                y=y_position,
-                xref='x',
-                yref='paper',
-                text=f"<b>{event['event']}</b>",
-                showarrow=True,
-                arrowhead=2,
-                arrowsize=1,
-                arrowwidth=1.5,
-                arrowcolor=color,
-                ax=0,
-                ay=-20,
-                bordercolor=color,
-                borderwidth=1,
-                borderpad=4,
-                bgcolor='rgba(255, 255, 255, 0.95)',
-                opacity=1,
-                font=dict(
-                    size=11,
-                    color='#2c3e50',
-                    family='Arial'
-                ),
-                hovertext=(
-                    f"<b><span style='font-size:14px;color:#2c3e50'>{event['description']}</span></b><br><br>"
-                    f"<span style='color:#1f77b4'><b>Impact:</b></span> {event['ridership_impact']}<br>"
-                    f"<span style='color:#2ca02c'><b>Phase:</b></span> {event['phase']}<br>" 
-                    f"<span style='color:#d62728'><b>Impact Level:</b></span> {event['impact_level']}"
-                )
-            ))
+# Animation settings of the month slider and its play/stop buttons
+MONTH_FRAME_STEP = dict(frame=dict(duration=0, redraw=True), mode='immediate', fromcurrent=True,
+                        transition=dict(duration=0, easing='linear'))
+MONTH_FRAME_PLAY = dict(frame=dict(duration=500, redraw=True), mode='immediate', fromcurrent=True,
+                        transition=dict(duration=500, easing='linear'))
 
-        fig.update_layout(annotations=annotations)
+MODE_COMPARISON_LAYOUT = chart_layout(
+    title="Monthly Ridership by Mode",
+    height=550,
+    xaxis=dict(title_text="Mode"),
+    yaxis=dict(title_text="Ridership"),
+    legend=dict(title_text="Mode", tracegroupgap=0),
+    updatemenus=[dict(
+        type='buttons',
+        direction='left',
+        buttons=[
+            dict(label='&#9654;', method='animate', args=[None, MONTH_FRAME_PLAY]),
+            dict(label='&#9724;', method='animate', args=[[None], MONTH_FRAME_STEP])
+        ],
+        pad=dict(r=10, t=70),
+        showactive=False,
+        x=0.1, xanchor='right', y=0, yanchor='top'
+    )]
+)
+
+def generate_mode_comparison_chart(months, monthly_ridership, modes):
+    """Bar chart of each mode's ridership in a month, animated month by month
 
-    return apply_chart_template(fig, title="Overview", height=550)
+    monthly_ridership holds the ridership sums of each month (rows) and mode
+    (columns, in the order of modes) as returned by PeriodRollups.select;
+    months are its 'YYYY-MM' labels.
+    """
+    def bars(row):
+        return [
+            go.Bar(
+                x=[mode],
+                y=[monthly_ridership[row, column]],
+                name=mode,
+                legendgroup=mode,
+                marker_color=MODE_COLORS[mode],
+                hovertemplate=f"<b>{mode}</b><br>{months[row]}<br>"
+                              "Ridership: %{y:,.0f}<extra></extra>"
+            )
+            for column, mode in enumerate(modes)
+        ]
 
-def generate_mode_comparison_chart(df):
-    """Generate a comparative bar chart with animation capabilities."""
-    fig = px.bar(
-        df,
-        x='Mode',
-        y='Ridership',
-        color='Mode',
-        animation_frame=df['Date'].dt.strftime('%Y-%m'),
-        range_y=[0, df['Ridership'].max() * 1.1],
-        title='Monthly Ridership by Mode'
+    steps = [dict(label=month, method='animate', args=[[month], MONTH_FRAME_STEP]) for month in months]
+    fig = go.Figure(
+        data=bars(0) if months else [],
+        layout=MODE_COMPARISON_LAYOUT,
+        frames=[go.Frame(data=bars(row), name=month) for row, month in enumerate(months)]
     )
-    
-    
-    return apply_chart_template(
-        fig,
-        title="Monthly Ridership by Mode",
-        height=550
+    fig.update_layout(
+        xaxis=dict(categoryorder='array', categoryarray=modes),
+        sliders=[dict(active=0, currentvalue=dict(prefix="Month: "), len=0.9,
+                      pad=dict(b=10, t=60), x=0.1, xanchor='left', y=0, yanchor='top', steps=steps)]
     )
+    if months:
+        fig.update_layout(yaxis_range=[0, monthly_ridership.max() * 1.1])
+    return fig
+
+RECOVERY_TIMELINE_LAYOUT = chart_layout(title="Recovery Timeline: Different Paths to Normal", height=550)
 
 def generate_recovery_timeline(filtered_data):
     """Generate the recovery timeline visualization"""
-    fig = go.Figure()
-    
-    # Custom colors (keep the same color dictionary)
-    colors = {
-        'Subways': '#345995',
-        'Buses': '#03cea4',
-        'LIRR': '#e40066',
-        'Metro-North': '#eac435',
-        'Access-A-Ride': '#fb4d3d',
-        'Bridges and Tunnels': '#234985',
-        'Staten Island Railway': '#02a87d'
-    }
+    traces = []
     
     for mode in filtered_data['Mode'].unique():
         mode_data = filtered_data[filtered_data['Mode'] == mode]
-        recovery_ma = mode_data.sort_values('Date').set_index('Date')['Recovery_Percentage'].rolling(30).mean()
         
-        fig.add_trace(
+        traces.append(
             go.Scatter(
-                x=recovery_ma.index,
-                y=recovery_ma * 100,
+                x=mode_data['Date'],
+                y=mode_data['Recovery_30day_MA'] * 100,
                 name=mode,
-                line=dict(color=colors[mode], width=2),
+                meta=mode,
+                line=dict(color=MODE_COLORS[mode], width=2),
                 hovertemplate="<b>%{x}</b><br>" +
                             f"{mode}<br>" +
                             "Recovery: %{y:.1f}%<extra></extra>"
             )
         )
         
-    return apply_chart_template(fig, title="Recovery Timeline: Different Paths to Normal", height=550)
+    return go.Figure(data=traces, layout=RECOVERY_TIMELINE_LAYOUT)
 
-def generate_weekday_weekend_comparison(filtered_data):
-    """Generate an enhanced weekday vs weekend violin plot with split violins"""
-    fig = go.Figure()
-    
-    # Base colors
-    base_colors = {
-        'Subways': '#345995',
-        'Buses': '#03cea4',
-        'LIRR': '#e40066',
-        'Metro-North': '#eac435',
-        'Access-A-Ride': '#fb4d3d',
-        'Bridges and Tunnels': '#234985',
-        'Staten Island Railway': '#02a87d'
-    }
-    
-    # Create lighter and darker versions of each color
-    colors = {
-        mode: {
-            'weekday': f'rgba{tuple(max(0, int(c * 255 - 25)) for c in rgb_to_rgba(color)[:3] + (0.6,))}',  # Más claro
-            'weekend': f'rgba{tuple(int(c * 255 + 25) for c in rgb_to_rgba(color)[:3] + (1,))}'      # Más oscuro
-        }
-        for mode, color in base_colors.items()
-    }
+WEEKDAY_WEEKEND_LAYOUT = chart_layout(
+    title="Weekday vs Weekend Recovery Patterns",
+    height=550,
+    xaxis=dict(
+        title_text="Transportation Mode",
+        title_font=dict(size=14),
+        tickmode='array',
+        zeroline=False
+    ),
+    yaxis=dict(
+        title_text="Recovery Rate (%)",
+        zeroline=False,
+        title_font=dict(size=14)
+    ),
+)
+
+def generate_weekday_weekend_comparison(summaries):
+    """Generate an enhanced weekday vs weekend violin plot with split violins
+
+    summaries maps each mode to its 'Weekday' and 'Weekend' recovery
+    distribution summaries (see scripts/distributions.py). Each half violin
+    is drawn from the precomputed KDE curve, so the payload doesn't grow
+    with the number of days.
+    """
+    traces = []
     
-    for mode in filtered_data['Mode'].unique():
-        # Weekday violin
-        weekday_data = filtered_data[
-            (filtered_data['Mode'] == mode) & 
-            (filtered_data['IsWeekend'] == False)
-        ]['Recovery_Percentage'] * 100
-        
-        fig.add_trace(go.Violin(
-            x=[mode] * len(weekday_data),
-            y=weekday_data,
-            legendgroup='Weekday',
-            scalegroup=mode,
-            name='Weekday',
-            side='negative',
-            line_color=colors[mode]['weekday'],
-            meanline_visible=True,
-            showlegend=True if mode == list(filtered_data['Mode'].unique())[0] else False,
-            hovertemplate=(
-                f"<b>{mode}</b><br>" +
-                "Type: Weekday<br>" +
-                "Recovery: %{y:.1f}%<br>" +
-                f"Mean: {weekday_data.mean():.1f}%<extra></extra>"
-            )
-        ))
-        
-        # Weekend violin
-        weekend_data = filtered_data[
-            (filtered_data['Mode'] == mode) & 
-            (filtered_data['IsWeekend'] == True)
-        ]['Recovery_Percentage'] * 100
+    modes = list(summaries)
+    for position, mode in enumerate(modes):
+        halves = summaries[mode]
+        densities = [summary['density'].max() for summary in halves.values() if summary is not None]
+        if not densities:
+            continue
+        # Both halves of a mode share one width scale, like a violin scalegroup
+        peak = max(densities)
         
-        fig.add_trace(go.Violin(
-            x=[mode] * len(weekend_data),
-            y=weekend_data,
-            legendgroup='Weekend',
-            scalegroup=mode,
-            name='Weekend',
-            side='positive',
-            line_color=colors[mode]['weekend'],
-            meanline_visible=True,
-            showlegend=True if mode == list(filtered_data['Mode'].unique())[0] else False,
-            hovertemplate=(
-                f"<b>{mode}</b><br>" +
-                "Type: Weekend<br>" +
-                "Recovery: %{y:.1f}%<br>" +
-                f"Mean: {weekend_data.mean():.1f}%<extra></extra>"
-            )
-        ))
+        for day_type, side in (('Weekday', -1), ('Weekend', 1)):
+            summary = halves[day_type]
+            if summary is None:
+                continue
+            grid, mean = summary['grid'], summary['mean']
+            width = side * 0.45 / peak
+            
+            # Outline of the half violin, then its mean line
+            x = np.concatenate([[position], position + width * summary['density'], [position],
+                                [np.nan, position, position + width * np.interp(mean, grid, summary['density'])]])
+            y = np.concatenate([[grid[0]], grid, [grid[-1]], [np.nan, mean, mean]])
+            
+            traces.append(go.Scatter(
+                x=x,
+                y=y,
+                mode='lines',
+                fill='toself',
+                legendgroup=day_type,
+                name=day_type,
+                meta=mode,
+                line=dict(color=WEEKDAY_WEEKEND_COLORS[mode][day_type.lower()], width=1.5),
+                showlegend=position == 0,
+                hovertemplate=(
+                    f"<b>{mode}</b><br>" +
+                    f"Type: {day_type}<br>" +
+                    "Recovery: %{y:.1f}%<br>" +
+                    f"Mean: {mean:.1f}%<extra></extra>"
+                )
+            ))
     
-    # Rest of the layout configuration remains the same
+    # One tick per mode shown; the rest of the layout is prebuilt
+    fig = go.Figure(data=traces, layout=WEEKDAY_WEEKEND_LAYOUT)
     fig.update_layout(
         xaxis=dict(
-            title_text="Transportation Mode",
-            title_font=dict(size=14),
-        ),
-        yaxis=dict(
-            title_text="Recovery Rate (%)",
-            zeroline=False,
-            title_font=dict(size=14)
-        ),
+            tickvals=list(range(len(modes))),
+            ticktext=modes,
+            range=[-0.6, len(modes) - 0.4]
+        )
     )
-    
-    return apply_chart_template(fig, title="Weekday vs Weekend Recovery Patterns", height=550)
+    return fig
 
-# Función auxiliar para convertir colores hex a rgba
-def rgb_to_rgba(hex_color):
-    """Convert hex color to rgba values"""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16)/255 for i in (0, 2, 4))
+MONTHLY_HEATMAP_LAYOUT = chart_layout(
+    title="Monthly Recovery Evolution",
+    height=550,
+    xaxis=dict(
+        title_text="Month-Year",
+        title_font=dict(size=14),
+        tickangle=-45,
+    ),
+    yaxis=dict(
+        title_text="Transportation Mode",
+        title_font=dict(size=14),
+        type='category'
+    ),
+)
 
-def generate_monthly_recovery_heatmap(filtered_data):
-    """Generate the monthly recovery heatmap with custom colormap"""
-    monthly_recovery = filtered_data.groupby(
-        ['Mode', 'Year', 'Month']
-    )['Recovery_Percentage'].mean().reset_index()
-    
-    heatmap_data = monthly_recovery.pivot_table(
-        values='Recovery_Percentage',
-        index='Mode',
-        columns=['Year', 'Month'],
-        aggfunc='mean'
-    )
-    
-    # Custom colorscale using app's color palette
-    colorscale = [
-        [0, '#fb4d3d'],      # Rojo para valores bajos (del Access-A-Ride)
-        [0.3, '#eac435'],    # Amarillo (del Metro-North)
-        [0.6, '#03cea4'],    # Verde azulado (del Buses)
-        [0.8, '#345995'],    # Azul (del Subways)
-        [1, '#234985']       # Azul oscuro (del Bridges and Tunnels)
-    ]
+def generate_monthly_recovery_heatmap(monthly_recovery):
+    """Generate the monthly recovery heatmap with custom colormap
+
+    monthly_recovery holds mean recovery per month (rows) and mode (columns),
+    as returned by PeriodRollups.means.
+    """
+    # Modes in alphabetical order; months without any data are left out
+    heatmap_data = monthly_recovery.T.sort_index().dropna(axis=1, how='all')
     
-    fig = go.Figure(data=[
+    return go.Figure(data=[
         go.Heatmap(
             z=heatmap_data.values * 100,
-            x=[f"{year}-{month:02d}" for year, month in heatmap_data.columns],
+            x=[period.strftime('%Y-%m') for period in heatmap_data.columns],
             y=heatmap_data.index,
-            colorscale=colorscale,
+            colorscale=HEATMAP_COLORSCALE,
             zmin=0,
             zmax=100,
             showscale=True,
@@ -442,155 +595,59 @@ def generate_monthly_recovery_heatmap(filtered_data):
                         "Date: %{x}<br>" +
                         "Recovery: %{z:.1f}%<extra></extra>"
         )
-    ])
-    
-    fig.update_layout(
-        xaxis=dict(
-            title_text="Month-Year",
-            title_font=dict(size=14),
-            tickangle=-45,
-        ),
-        yaxis=dict(
-            title_text="Transportation Mode",
-            title_font=dict(size=14),
-            type='category'
-        ),
-    )
-    
-    return apply_chart_template(fig, title="Monthly Recovery Evolution", height=550)
+    ], layout=MONTHLY_HEATMAP_LAYOUT)
 
-def generate_yearly_comparison_chart(df, selected_mode):
-    """Generate a year-over-year comparison chart for a selected mode."""
-    # Filter for selected mode
-    mode_data = df[df['Mode'] == selected_mode].copy()
-    
-    # Calculate 7-day moving average for the entire series first
-    mode_data['Smooth_Ridership'] = mode_data['Ridership'].rolling(
-        window=7, 
-        center=True,
-        min_periods=1
-    ).mean()
-    
-    # Create a date index with just month and day for all years
-    mode_data['month_day'] = pd.to_datetime(
-        '2000-' + mode_data['Date'].dt.strftime('%m-%d')
-    )
-    
-    # Create figure
-    fig = go.Figure()
-    
-    # Color scale for years (light to dark blue)
-    years = sorted(mode_data['Year'].unique())
-    n_years = len(years)
-    colors = [f'rgba(52, 89, 149, {0.3 + (i * 0.7/n_years)})' for i in range(n_years)]
-    
-    # Add a trace for each year
-    for year, color in zip(years, colors):
-        year_data = mode_data[mode_data['Year'] == year].copy()
-        year_data = year_data.sort_values('month_day')
-        
-        fig.add_trace(
-            go.Scatter(
-                x=year_data['month_day'],
-                y=year_data['Smooth_Ridership'],
-                name=str(year),
-                line=dict(
-                    color=color,
-                    width=3,
-                    shape='spline',  # Suaviza las líneas
-                ),
-                hovertemplate=(
-                    "<b>%{x|%B %d}</b><br>"
-                    "Ridership: %{y:,.0f}<br>"
-                    f"Year: {year}"
-                    "<extra></extra>"
-                )
-            )
-        )
-    
-    # Update layout
-    fig.update_layout(
-        xaxis_title='Month',
-        yaxis_title='Daily Ridership (7-day moving average)',
-        showlegend=True,
-        margin=dict(l=60, r=150, t=100, b=60),
-        xaxis=dict(
-            tickformat='%B',  # Nombre completo del mes
-            dtick='M1',
-            range=['2000-01-01', '2000-12-31'],
-            showgrid=True,
-            gridcolor='rgba(0,0,0,0.1)',
-            gridwidth=1,
-            tickfont=dict(size=12),
-            title_font=dict(size=14)
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='rgba(0,0,0,0.1)',
-            gridwidth=1,
-            tickformat=',d',  # Formato con separadores de miles
-            tickfont=dict(size=12),
-            title_font=dict(size=14)
-        ),
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(family='Arial'),
-        hoverlabel=dict(
-            bgcolor='white',
-            font_size=14,
-            font_family='Arial'
-        )
-    )
-    
-    # Definir períodos estacionales
-    seasonal_periods = [
-        {
-            'name': 'New Year',
-            'start': '12-24',
-            'end': '01-02',
-            'color': 'rgba(169, 169, 169, 0.15)',
-            'text': 'New Year<br>Holiday Period',
-            'y_position': 0.95
-        },
-        {
-            'name': 'Independence Day',
-            'start': '07-01',
-            'end': '07-07',
-            'color': 'rgba(169, 169, 169, 0.15)',
-            'text': 'Independence Day<br>Week',
-            'y_position': 0.85
-        },
-        {
-            'name': 'Labor Day',
-            'start': '09-01',
-            'end': '09-07',
-            'color': 'rgba(169, 169, 169, 0.15)',
-            'text': 'Labor Day<br>Week',
-            'y_position': 0.75
-        },
-        {
-            'name': 'Memorial Day',
-            'start': '05-25',
-            'end': '05-31',
-            'color': 'rgba(169, 169, 169, 0.15)',
-            'text': 'Memorial Day<br>Week',
-            'y_position': 0.65
-        },
-        {
-            'name': 'Thanksgiving',
-            'start': '11-22',
-            'end': '11-28',
-            'color': 'rgba(169, 169, 169, 0.15)',
-            'text': 'Thanksgiving<br>Week',
-            'y_position': 0.55
-        }
-    ]
-    
+# Definir períodos estacionales
+SEASONAL_PERIODS = [
+    {
+        'name': 'New Year',
+        'start': '12-24',
+        'end': '01-02',
+        'color': 'rgba(169, 169, 169, 0.15)',
+        'text': 'New Year<br>Holiday Period',
+        'y_position': 0.95
+    },
+    {
+        'name': 'Independence Day',
+        'start': '07-01',
+        'end': '07-07',
+        'color': 'rgba(169, 169, 169, 0.15)',
+        'text': 'Independence Day<br>Week',
+        'y_position': 0.85
+    },
+    {
+        'name': 'Labor Day',
+        'start': '09-01',
+        'end': '09-07',
+        'color': 'rgba(169, 169, 169, 0.15)',
+        'text': 'Labor Day<br>Week',
+        'y_position': 0.75
+    },
+    {
+        'name': 'Memorial Day',
+        'start': '05-25',
+        'end': '05-31',
+        'color': 'rgba(169, 169, 169, 0.15)',
+        'text': 'Memorial Day<br>Week',
+        'y_position': 0.65
+    },
+    {
+        'name': 'Thanksgiving',
+        'start': '11-22',
+        'end': '11-28',
+        'color': 'rgba(169, 169, 169, 0.15)',
+        'text': 'Thanksgiving<br>Week',
+        'y_position': 0.55
+    }
+]
+
+def seasonal_overlay():
+    """Shaded zones and annotations of the seasonal periods on the common (year 2000) calendar"""
     # Agregar zonas sombreadas y anotaciones
     shapes = []
     annotations = []
     
-    for period in seasonal_periods:
+    for period in SEASONAL_PERIODS:
         # Manejar el caso especial de Año Nuevo que cruza el cambio de año
         if period['name'] == 'New Year':
             # Agregar zona de fin de año
@@ -658,38 +715,198 @@ def generate_yearly_comparison_chart(df, selected_mode):
             borderpad=4
         ))
     
-    # Actualizar el layout con las formas y anotaciones
-    fig.update_layout(
-        shapes=shapes + [
-            # Borde del gráfico (del código anterior)
-            dict(
-                type='rect',
-                xref='paper',
-                yref='paper',
-                x0=0,
-                y0=0,
-                x1=1,
-                y1=1,
+    # Borde del gráfico (del código anterior)
+    shapes.append(dict(
+        type='rect',
+        xref='paper',
+        yref='paper',
+        x0=0,
+        y0=0,
+        x1=1,
+        y1=1,
+        line=dict(
+            color='rgba(0,0,0,0.1)',
+            width=1
+        ),
+        fillcolor='rgba(0,0,0,0)'
+    ))
+    return shapes, annotations
+
+_seasonal_shapes, _seasonal_annotations = seasonal_overlay()
+
+YEARLY_LAYOUT = chart_layout(
+    height=550,
+    showlegend=True,
+    margin=dict(l=60, r=150, t=100, b=60),
+    xaxis=dict(
+        title_text='Month',
+        tickformat='%B',  # Nombre completo del mes
+        dtick='M1',
+        range=['2000-01-01', '2000-12-31'],
+        showgrid=True,
+        gridcolor='rgba(0,0,0,0.1)',
+        gridwidth=1,
+        tickfont=dict(size=12),
+        title_font=dict(size=14)
+    ),
+    yaxis=dict(
+        title_text='Daily Ridership (7-day moving average)',
+        showgrid=True,
+        gridcolor='rgba(0,0,0,0.1)',
+        gridwidth=1,
+        tickformat=',d',  # Formato con separadores de miles
+        tickfont=dict(size=12),
+        title_font=dict(size=14)
+    ),
+    plot_bgcolor='white',
+    paper_bgcolor='white',
+    font=dict(family='Arial'),
+    hoverlabel=dict(
+        bgcolor='white',
+        font_size=14,
+        font_family='Arial'
+    ),
+    shapes=_seasonal_shapes,
+    annotations=_seasonal_annotations
+)
+
+def generate_yearly_comparison_chart(alignment, selected_mode):
+    """Generate a year-over-year comparison chart for a selected mode.
+
+    alignment is the dataset's YearlyAlignment of the centered 7-day moving
+    average, with each year already placed on a common (year 2000) calendar.
+    """
+    traces = []
+    
+    # Color scale for years (light to dark blue)
+    years = alignment.years
+    n_years = len(years)
+    colors = [f'rgba(52, 89, 149, {0.3 + (i * 0.7/n_years)})' for i in range(n_years)]
+    
+    # Add a trace for each year
+    for year_index, (year, color) in enumerate(zip(years, colors)):
+        month_day, smooth_ridership = alignment.series(selected_mode, year_index)
+        
+        traces.append(
+            go.Scatter(
+                x=month_day,
+                y=smooth_ridership,
+                name=str(year),
                 line=dict(
-                    color='rgba(0,0,0,0.1)',
-                    width=1
+                    color=color,
+                    width=3,
+                    shape='spline',  # Suaviza las líneas
                 ),
-                fillcolor='rgba(0,0,0,0)'
+                hovertemplate=(
+                    "<b>%{x|%B %d}</b><br>"
+                    "Ridership: %{y:,.0f}<br>"
+                    f"Year: {year}"
+                    "<extra></extra>"
+                )
             )
-        ],
-        annotations=annotations
-    )
+        )
     
-    return apply_chart_template(fig, title=f"{selected_mode} Ridership Patterns by Year", height=550)
-
-@lru_cache(maxsize=32)
-def calculate_statistics(df_records, mode):
-    df = pd.DataFrame.from_records(df_records)
-    stats = {
-        'total_ridership': df['Ridership'].sum(),
-        'daily_avg': df['Ridership'].mean(),
-        'peak_day': df.loc[df['Ridership'].idxmax()]['Date'],
-        'peak_value': df['Ridership'].max()
-    }
-    return stats
+    # Axes, seasonal zones and annotations come with the prebuilt layout
+    fig = go.Figure(data=traces, layout=YEARLY_LAYOUT)
+    fig.update_layout(title_text=f"{selected_mode} Ridership Patterns by Year")
+    return fig
+
+def _recovery_distributions(data, filtered_data, modes, start_date, end_date):
+    """Weekday/weekend recovery summaries of a selection
+
+    Precomputed for the full history; a custom date range is summarized from
+    its filtered rows.
+    """
+    if _prepare_date_range_for_cache(data.store, start_date, end_date) == (None, None):
+        return {mode: summary for mode, summary in data.recovery_distributions.items() if mode in modes}
+    return weekday_weekend_summaries(filtered_data)
 
+def _monthly_ridership(data, modes, start_date, end_date):
+    """(month labels, ridership sums, modes) of a selection, from the monthly rollups"""
+    months, sums, _ = data.rollups.select('monthly', 'Ridership', modes, start_date, end_date)
+    selected = [mode for mode in data.stats_cube.modes if mode in set(modes)]
+    return [month.strftime('%Y-%m') for month in months], sums, selected
+
+# Figure builders by chart id, for rendering outside the callbacks.
+# Each takes (data, filtered_data, modes, start_date, end_date) and returns a
+# go.Figure; the overview also takes a max_points budget.
+CHART_BUILDERS = {
+    'overview-chart': lambda data, df, modes, *_, max_points=None: generate_overview_chart(
+        df, data.timeline_events, max_points
+    ),
+    # Served from the monthly rollups rather than every daily row
+    'mode-comparison-chart': lambda data, df, modes, start_date, end_date: generate_mode_comparison_chart(
+        *_monthly_ridership(data, modes, start_date, end_date)
+    ),
+    'recovery-timeline': lambda data, df, modes, *_: generate_recovery_timeline(df),
+    'weekday-weekend-comparison': lambda data, df, modes, start_date, end_date: generate_weekday_weekend_comparison(
+        _recovery_distributions(data, df, modes, start_date, end_date)
+    ),
+    # Served from the monthly rollups rather than regrouping daily rows
+    'monthly-recovery-heatmap': lambda data, df, modes, start_date, end_date: generate_monthly_recovery_heatmap(
+        data.rollups.means('monthly', 'Recovery_Percentage', modes, start_date, end_date)
+    ),
+    # Year-over-year always uses the full history of a single mode
+    'yearly-comparison-chart': lambda data, df, modes, *_: generate_yearly_comparison_chart(
+        data.yearly_alignment, modes[0]
+    ),
+}
+
+# Charts whose builders don't use the filtered daily rows
+_UNFILTERED_CHARTS = {'mode-comparison-chart', 'monthly-recovery-heatmap', 'yearly-comparison-chart'}
+
+def overview_point_budget(plot_width):
+    """Points per overview trace for a plot area plot_width pixels wide
+
+    Two per pixel column (its min and max, see minmax_indices), with the
+    width clamped and rounded up to OVERVIEW_WIDTH_STEP. An unknown width
+    gets OVERVIEW_MAX_POINTS.
+    """
+    try:
+        width = int(plot_width)
+    except (TypeError, ValueError):
+        return OVERVIEW_MAX_POINTS
+    if width <= 0:
+        return OVERVIEW_MAX_POINTS
+    width = min(-(-width // OVERVIEW_WIDTH_STEP) * OVERVIEW_WIDTH_STEP, OVERVIEW_MAX_WIDTH)
+    return 2 * width
+
+def render_figure(chart_id, data, modes, start_date=None, end_date=None, max_points=None):
+    """Render a chart from scratch for the given selection
+
+    max_points overrides the overview's point budget (other charts take none).
+    """
+    data = _snapshot_of(data)
+    modes_tuple = _prepare_modes_for_cache(modes)
+    filtered_data = None
+    if chart_id not in _UNFILTERED_CHARTS:
+        filtered_data = filter_data(data, modes_tuple, start_date, end_date)
+    options = {} if max_points is None else {'max_points': max_points}
+    return CHART_BUILDERS[chart_id](data, filtered_data, modes_tuple, start_date, end_date, **options)
+
+def figure_key(chart_id, data, modes, start_date=None, end_date=None, max_points=None):
+    """Figure cache key of a chart and selection, with modes and dates normalised"""
+    return FigureCache.make_key(
+        chart_id,
+        _prepare_modes_for_cache(modes),
+        *_prepare_date_range_for_cache(_snapshot_of(data).store, start_date, end_date),
+        max_points=max_points
+    )
+
+def get_figure(chart_id, data, modes, start_date=None, end_date=None, max_points=None):
+    """Cached figure dict for a chart and selection, rendered on first use"""
+    snapshot = _snapshot_of(data)
+    return FIGURE_CACHE.get_or_build(
+        figure_key(chart_id, snapshot, modes, start_date, end_date, max_points),
+        lambda: render_figure(chart_id, snapshot, modes, start_date, end_date, max_points),
+        owner=snapshot
+    )
+
+def get_figure_json(chart_id, data, modes, start_date=None, end_date=None, max_points=None):
+    """Like get_figure, but returns the serialized figure as cached"""
+    snapshot = _snapshot_of(data)
+    return FIGURE_CACHE.get_or_build_json(
+        figure_key(chart_id, snapshot, modes, start_date, end_date, max_points),
+        lambda: render_figure(chart_id, snapshot, modes, start_date, end_date, max_points),
+        owner=snapshot
+    )
@@ -0,0 +1,137 @@
+# Pre-render figures for every mode selection and persist them for the figure cache.
+#
+# Usage: python -m scripts.warmup [--top N] [--workers K] [--popularity counts.json]
+
+import argparse
+import json
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from scripts.data_processing import DEFAULT_DATA_PATH, MTARidershipData
+from scripts.figure_cache import FigureCache
+from scripts.figure_encoding import figure_to_json
+from scripts.reshape import MODES
+from scripts.visualization import figure_persist_dir, initialize_cache_arrays, render_figure
+
+logger = logging.getLogger(__name__)
+
+# Charts driven by the mode selector, and the per-mode year-over-year chart
+MODE_SELECTOR_CHARTS = [
+    'overview-chart',
+    'mode-comparison-chart',
+    'recovery-timeline',
+    'weekday-weekend-comparison',
+    'monthly-recovery-heatmap'
+]
+SINGLE_MODE_CHARTS = ['yearly-comparison-chart']
+
+# Per-process dataset used by the pool workers
+_worker_data = None
+
+
+def selection_key(modes):
+    """Stable text form of a selection, as used in popularity files."""
+    return '|'.join(sorted(modes))
+
+
+def ranked_selections(popularity=None):
+    """All 127 non-empty mode subsets, most popular first.
+
+    Without popularity counts, the dashboard default (every mode) comes
+    first, followed by smaller selections before larger ones.
+    """
+    popularity = popularity or {}
+    everything = tuple(sorted(MODES))
+    subsets = [tuple(sorted(combo))
+               for size in range(1, len(MODES) + 1)
+               for combo in combinations(MODES, size)]
+    return sorted(subsets, key=lambda modes: (
+        -popularity.get(selection_key(modes), 0),
+        modes != everything,
+        len(modes),
+        modes
+    ))
+
+
+def _init_worker(filepath, cache_dir):
+    global _worker_data
+    logging.getLogger('scripts.data_processing').setLevel(logging.WARNING)
+    _worker_data = MTARidershipData(filepath, cache_dir=cache_dir)
+    _worker_data.load()
+    initialize_cache_arrays(_worker_data)
+
+
+def _render(task):
+    """Render one figure in a pool worker; returns (key, payload, seconds)."""
+    chart_id, modes = task
+    start = time.perf_counter()
+    payload = figure_to_json(render_figure(chart_id, _worker_data, modes))
+    return FigureCache.make_key(chart_id, modes), payload, time.perf_counter() - start
+
+
+def warm_up(data, top=None, workers=None, popularity=None):
+    """Render and persist figures for the `top` most popular selections (all by default).
+
+    Figures already persisted for this dataset version are skipped. Returns
+    the render times in seconds grouped by chart id.
+    """
+    persist_dir = figure_persist_dir(data)
+    if persist_dir is None:
+        raise ValueError("Warm-up needs a cached dataset (MTARidershipData.load with a cache_dir)")
+    cache = FigureCache(persist_dir=persist_dir)
+
+    selections = ranked_selections(popularity)[:top]
+    single_modes = sorted(MODES, key=lambda mode: -(popularity or {}).get(mode, 0))[:top]
+    tasks = [(chart_id, modes) for modes in selections for chart_id in MODE_SELECTOR_CHARTS]
+    tasks += [(chart_id, (mode,)) for mode in single_modes for chart_id in SINGLE_MODE_CHARTS]
+    tasks = [(chart_id, modes) for chart_id, modes in tasks
+             if not cache.is_persisted(FigureCache.make_key(chart_id, modes))]
+
+    timings = defaultdict(list)
+    if not tasks:
+        logger.info("Figure cache already warm")
+        return timings
+
+    logger.info(f"Rendering {len(tasks)} figures into {persist_dir}")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(data.filepath, data.cache_dir)) as pool:
+        for key, payload, seconds in pool.map(_render, tasks, chunksize=8):
+            cache.persist(key, payload)
+            timings[key[0]].append(seconds)
+    return timings
+
+
+def report(timings):
+    """Print per-chart render time statistics."""
+    print(f"{'chart':<28} {'figures':>7} {'mean ms':>8} {'max ms':>8} {'total s':>8}")
+    for chart_id, seconds in sorted(timings.items()):
+        print(f"{chart_id:<28} {len(seconds):>7} {1000 * sum(seconds) / len(seconds):>8.1f} "
+              f"{1000 * max(seconds):>8.1f} {sum(seconds):>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render dashboard figures for every mode selection")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help="Source CSV")
+    parser.add_argument('--top', type=int, default=None,
+                        help="Only warm the N most popular selections")
+    parser.add_argument('--workers', type=int, default=None, help="Render processes")
+    parser.add_argument('--popularity', default=None,
+                        help="JSON file mapping 'Mode A|Mode B' selections to request counts")
+    args = parser.parse_args()
+
+    popularity = None
+    if args.popularity:
+        with open(args.popularity) as f:
+            popularity = json.load(f)
+
+    data = MTARidershipData(args.data)
+    if not data.load():
+        raise SystemExit("Could not load ridership data")
+    report(warm_up(data, top=args.top, workers=args.workers, popularity=popularity))
+
+
+if __name__ == '__main__':
+    main()
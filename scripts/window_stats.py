@@ -0,0 +1,77 @@
+# Rolling window statistics computed over (dates x modes) blocks.
+
+import numpy as np
+import pandas as pd
+
+# Output column -> (source column, window, centered, min_periods)
+WINDOW_SPECS = {
+    'Ridership_7day_MA': ('Ridership', 7, False, 1),
+    'Ridership_7day_Smoothed': ('Ridership', 7, True, 1),
+    'Ridership_7day_CMA': ('Ridership', 7, True, 7),
+    'Ridership_14day_CMA': ('Ridership', 14, True, 14),
+    'Recovery_30day_MA': ('Recovery_Percentage', 30, False, 30)
+}
+
+
+def _window_bounds(n, window, center):
+    """Start (inclusive) and stop (exclusive) row of each output row's window.
+
+    Centered windows follow pandas: the extra row of an even window falls
+    before the label.
+    """
+    after = (window - 1) // 2 if center else 0
+    before = window - 1 - after
+    rows = np.arange(n)
+    return np.maximum(rows - before, 0), np.minimum(rows + after + 1, n)
+
+
+def rolling_mean_cumsum(values, window, center=False, min_periods=None):
+    """Rolling mean of every column of a 2-D array using cumulative sums.
+
+    NaNs are skipped; rows whose window holds fewer than min_periods valid
+    values (default: the full window) are NaN, as with pandas.
+    """
+    values = np.asarray(values, dtype=float)
+    min_periods = window if min_periods is None else min_periods
+
+    valid = ~np.isnan(values)
+    zeros = np.zeros((1, values.shape[1]))
+    sums = np.concatenate([zeros, np.cumsum(np.where(valid, values, 0.0), axis=0)])
+    counts = np.concatenate([zeros, np.cumsum(valid, axis=0)])
+
+    lo, hi = _window_bounds(values.shape[0], window, center)
+    window_sums = sums[hi] - sums[lo]
+    window_counts = counts[hi] - counts[lo]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = window_sums / window_counts
+    result[window_counts < max(min_periods, 1)] = np.nan
+    return result
+
+
+def rolling_mean_pandas(values, window, center=False, min_periods=None):
+    """Reference engine: pandas rolling over each column of a 2-D array."""
+    return (pd.DataFrame(values)
+            .rolling(window, center=center, min_periods=min_periods)
+            .mean()
+            .to_numpy())
+
+
+WINDOW_ENGINES = {
+    'cumsum': rolling_mean_cumsum,
+    'pandas': rolling_mean_pandas
+}
+
+
+def compute_window_stats(blocks, specs=None, engine='cumsum'):
+    """Compute every configured window for all modes in one pass per window.
+
+    blocks maps source column names to (dates x modes) arrays; the result maps
+    each output column in specs to an array of the same shape.
+    """
+    specs = WINDOW_SPECS if specs is None else specs
+    rolling_mean = WINDOW_ENGINES[engine]
+    return {
+        name: rolling_mean(blocks[source], window, center=center, min_periods=min_periods)
+        for name, (source, window, center, min_periods) in specs.items()
+    }
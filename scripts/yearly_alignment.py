@@ -0,0 +1,56 @@
+# Day-of-year alignment of the daily series, for year-over-year charts.
+
+import numpy as np
+import pandas as pd
+
+from scripts.reshape import long_to_wide
+
+# One slot per day of a leap year; slot 59 is Feb 29
+DAYS_PER_YEAR = 366
+ALIGNED_DATES = pd.date_range('2000-01-01', '2000-12-31').to_numpy()
+
+
+def day_slots(dates):
+    """Leap-year day-of-year slot (0-365) of each date, so a date lands in the same slot every year."""
+    dates = pd.DatetimeIndex(dates)
+    common_after_feb = ~dates.is_leap_year & (dates.month > 2)
+    return dates.dayofyear.to_numpy() - 1 + common_after_feb
+
+
+class YearlyAlignment:
+    """A daily measure laid out as one (years x 366) matrix per mode.
+
+    Built once per dataset. A year's series is a row of its mode's matrix,
+    read at the slots that hold a date (common years never fill Feb 29,
+    and partial years only fill the days they cover), so charts only slice.
+    """
+
+    def __init__(self, dates, modes, values):
+        self.modes = list(modes)
+        self._mode_index = {mode: i for i, mode in enumerate(self.modes)}
+        years = pd.DatetimeIndex(dates).year.to_numpy()
+        slots = day_slots(dates)
+        self.years = np.unique(years)
+        rows = np.searchsorted(self.years, years)
+
+        self.values = np.full((len(self.modes), len(self.years), DAYS_PER_YEAR), np.nan, dtype=values.dtype)
+        self.values[:, rows, slots] = np.asarray(values).T
+        # Slots holding a date, and their dates on the common calendar, per year
+        self.slots = np.split(slots, np.flatnonzero(np.diff(rows)) + 1)
+        self.aligned_dates = [ALIGNED_DATES[year_slots] for year_slots in self.slots]
+
+    @classmethod
+    def from_frame(cls, frame, column='Ridership_7day_Smoothed'):
+        """Align a column of a mode-major processed frame (see wide_to_long)."""
+        modes = list(frame['Mode'].cat.categories)
+        n_dates = len(frame) // len(modes)
+        return cls(
+            frame['Date'].to_numpy()[:n_dates],
+            modes,
+            long_to_wide(frame[column].to_numpy(), len(modes))
+        )
+
+    def series(self, mode, year_index):
+        """(aligned dates, values) of one mode and year (the year_index-th of self.years)."""
+        slots = self.slots[year_index]
+        return self.aligned_dates[year_index], self.values[self._mode_index[mode], year_index, slots]
@@ -0,0 +1,52 @@
+import os
+
+import pandas as pd
+import pytest
+
+from scripts.chunked_loader import stream_process_csv
+from scripts.data_processing import DEFAULT_DATA_PATH, MTARidershipData
+
+# A few months of the bundled export, enough for the 30-day trend windows
+SAMPLE_ROWS = 150
+
+
+@pytest.fixture
+def raw_rows():
+    return pd.read_csv(DEFAULT_DATA_PATH, nrows=SAMPLE_ROWS)
+
+
+def _load(raw, path):
+    raw.to_csv(path, index=False)
+    data = MTARidershipData(str(path), cache_dir=None)
+    assert data.load()
+    return data
+
+
+def test_unsorted_csv_matches_sorted(raw_rows, tmp_path):
+    ascending = _load(raw_rows, tmp_path / 'ascending.csv')
+    shuffled = raw_rows.sample(frac=1, random_state=0)
+    for name, raw in (('descending', raw_rows.iloc[::-1]), ('shuffled', shuffled)):
+        data = _load(raw, tmp_path / f"{name}.csv")
+        pd.testing.assert_frame_equal(data.processed_data, ascending.processed_data)
+        summary = data.stats_cube.summarize(['Subways', 'Buses'])
+        expected = ascending.stats_cube.summarize(['Subways', 'Buses'])
+        for key in ('total_ridership', 'current_period', 'previous_period', 'peak_day'):
+            assert summary[key] == expected[key]
+
+
+def test_duplicate_dates_keep_last_row(raw_rows, tmp_path):
+    correction = raw_rows.iloc[[10]].copy()
+    correction['Subways: Total Estimated Ridership'] = 1234
+    data = _load(pd.concat([raw_rows, correction]), tmp_path / 'duplicates.csv')
+
+    subways = data.get_mode_data('Subways')
+    assert len(subways) == SAMPLE_ROWS
+    day = subways[subways['Date'] == pd.Timestamp(correction['Date'].iloc[0])]
+    assert day['Ridership'].tolist() == [1234]
+
+
+def test_chunked_processing_rejects_unsorted_csv(raw_rows, tmp_path):
+    path = tmp_path / 'descending.csv'
+    raw_rows.iloc[::-1].to_csv(path, index=False)
+    with pytest.raises(ValueError):
+        stream_process_csv(str(path), os.path.join(tmp_path, 'chunks'), memory_budget=64 * 1024)